@@ -18,6 +18,7 @@ sys.path.insert(0, str(project_root))
 
 from src.config import config
 from src.logger import get_logger
+from src.jsonio import json_loads
 from src.improvement_history import improvement_history
 from src.ai_improver import ai_improver
 
@@ -95,9 +96,11 @@ class ImprovementEvaluator:
     def _load_test_results(self, test_results_file: str) -> List[Dict[str, Any]]:
         """テスト結果を読み込み"""
         try:
-            if Path(test_results_file).exists():
-                with open(test_results_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return json_loads(Path(test_results_file).read_bytes())
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            logger.error(f"テスト結果ファイルの形式が不正です: {e}")
         except Exception as e:
             logger.error(f"テスト結果読み込みエラー: {e}")
         return []
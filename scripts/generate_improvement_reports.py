@@ -19,6 +19,7 @@ sys.path.insert(0, str(project_root))
 
 from src.config import config
 from src.logger import get_logger
+from src.jsonio import json_loads
 from src.improvement_history import improvement_history
 
 logger = get_logger("generate_improvement_reports")
@@ -53,9 +54,11 @@ class ImprovementReportGenerator:
     def _load_evaluation_results(self, evaluation_results_file: str) -> Dict[str, Any]:
         """評価結果を読み込み"""
         try:
-            if Path(evaluation_results_file).exists():
-                with open(evaluation_results_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return json_loads(Path(evaluation_results_file).read_bytes())
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            logger.error(f"評価結果ファイルの形式が不正です: {e}")
         except Exception as e:
             logger.error(f"評価結果読み込みエラー: {e}")
         return {}
@@ -63,9 +66,11 @@ class ImprovementReportGenerator:
     def _load_test_results(self, test_results_file: str) -> List[Dict[str, Any]]:
         """テスト結果を読み込み"""
         try:
-            if Path(test_results_file).exists():
-                with open(test_results_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return json_loads(Path(test_results_file).read_bytes())
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            logger.error(f"テスト結果ファイルの形式が不正です: {e}")
         except Exception as e:
             logger.error(f"テスト結果読み込みエラー: {e}")
         return []
@@ -53,13 +53,13 @@ class ImprovementGenerator:
         # 対象戦略を決定
         target_strategies = [target_strategy] if target_strategy else list(self.strategies_config.keys())
         
+        # 提案生成の入力（戦略名 → (現在のパラメータ, パフォーマンスメトリクス)）
+        strategy_inputs = {}
         for strategy_name in target_strategies:
             if strategy_name not in self.strategies_config:
                 logger.warning(f"戦略 '{strategy_name}' が見つかりません")
                 continue
             
-            logger.info(f"戦略 '{strategy_name}' の改善提案を生成中...")
-            
             # 現在のパラメータを取得
             current_params = self.strategies_config[strategy_name]
             
@@ -70,12 +70,13 @@ class ImprovementGenerator:
                 logger.warning(f"戦略 '{strategy_name}' のパフォーマンスデータがありません")
                 continue
             
-            # 改善提案を生成
-            proposals = ai_improver.analyze_performance_and_propose_improvements(
-                strategy_name=strategy_name,
-                current_params=current_params,
-                performance_metrics=strategy_performance
-            )
+            strategy_inputs[strategy_name] = (current_params, strategy_performance)
+        
+        # 改善提案を生成（戦略ごとの候補生成は並列実行）
+        proposals_by_strategy = ai_improver.generate_all_proposals(strategy_inputs)
+        
+        for strategy_name, proposals in proposals_by_strategy.items():
+            current_params, strategy_performance = strategy_inputs[strategy_name]
             
             # 提案にメタデータを追加
             for proposal in proposals:
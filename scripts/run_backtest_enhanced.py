@@ -9,7 +9,7 @@ import random
 import time
 import argparse
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
 import pandas as pd
 import numpy as np
 from multiprocessing import Pool, cpu_count
@@ -40,6 +40,9 @@ class EnhancedBacktestRunner:
         self.universe_config = config.get_universe_config()
         self.output_config = config.get_output_config()
         
+        # 取得済み価格データのキャッシュ（ベースライン測定と本番実行で共有）
+        self._price_cache: Optional[Dict[str, pd.DataFrame]] = None
+        
         # 設定の検証
         self._validate_config()
         
@@ -138,14 +141,16 @@ class EnhancedBacktestRunner:
         else:
             random.seed(pd.Timestamp.today().date().toordinal())
             
-        # 学習用銘柄の選択
-        learn_pool = sorted(set(non_ai) - set(fixed_list))
+        # 学習用銘柄の選択（split_universeの順序を保ったまま重複除去）
+        fixed_set = set(fixed_list)
+        learn_pool = [t for t in dict.fromkeys(non_ai) if t not in fixed_set]
         learn_list = stratified_sample(learn_pool, sample_size, seed=random.random())
         
         # 検証用銘柄の選択
-        oos_pool = sorted(set(learn_pool) - set(learn_list) - set(fixed_list))
+        learn_set = set(learn_list)
+        oos_pool = [t for t in learn_pool if t not in learn_set]
         rand_oos = stratified_sample(oos_pool, oos_random_size, seed=random.random())
-        oos_all = sorted(set(rand_oos).union(set(fixed_list)))
+        oos_all = list(dict.fromkeys(rand_oos + fixed_list))
         
         logger.info(f"学習銘柄: {learn_list}")
         logger.info(f"検証銘柄（固定）: {fixed_list}")
@@ -155,29 +160,36 @@ class EnhancedBacktestRunner:
         
     def _load_data(self, tickers: List[str]) -> Dict[str, pd.DataFrame]:
         """データの一括取得"""
-        logger.info(f"データ取得開始: {len(tickers)}銘柄")
-        
-        # データ取得設定（環境変数から直接取得）
-        start_date = os.getenv('BACKTEST_START_DATE', '2005-01-01')
-        end_date = os.getenv('BACKTEST_END_DATE')
-        if end_date == 'null' or end_date == 'None':
-            end_date = None
-        
-        # 並列処理でデータ取得
-        with Pool(min(max(1, cpu_count() - 1), 6)) as pool:
-            args = [(ticker, start_date, end_date) for ticker in tickers]
-            results = pool.starmap(self._load_single_ticker, args)
-            
-        # 結果を辞書に変換
-        price_cache = {}
-        for ticker, data in zip(tickers, results):
-            if not data.empty:
-                price_cache[ticker] = data
+        if self._price_cache is None:
+            self._price_cache = {}
+            
+        # 取得済みの銘柄は再取得しない
+        missing = [t for t in dict.fromkeys(tickers) if t not in self._price_cache]
+        logger.info(f"データ取得開始: {len(tickers)}銘柄（新規取得 {len(missing)}銘柄）")
+        
+        if missing:
+            # データ取得設定（環境変数から直接取得）
+            start_date = os.getenv('BACKTEST_START_DATE', '2005-01-01')
+            end_date = os.getenv('BACKTEST_END_DATE')
+            if end_date == 'null' or end_date == 'None':
+                end_date = None
+            
+            # 並列処理でデータ取得
+            with Pool(min(max(1, cpu_count() - 1), 6)) as pool:
+                args = [(ticker, start_date, end_date) for ticker in missing]
+                results = pool.starmap(self._load_single_ticker, args)
                 
+            # 結果をキャッシュに追加
+            for ticker, data in zip(missing, results):
+                if not data.empty:
+                    self._price_cache[ticker] = data
+                    
+        price_cache = {t: self._price_cache[t] for t in tickers if t in self._price_cache}
         logger.info(f"データ取得完了: {len(price_cache)}銘柄成功")
         return price_cache
         
-    def _load_single_ticker(self, ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    @staticmethod
+    def _load_single_ticker(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
         """単一銘柄のデータ取得"""
         try:
             # end_dateの処理（'null'文字列をNoneに変換）
@@ -402,11 +414,19 @@ class EnhancedBacktestRunner:
         if res_df.empty:
             return {}
             
+        columns = res_df.columns
+        
+        def column_median(column: str) -> float:
+            """列の中央値（列が無い場合は0）"""
+            if column not in columns:
+                return 0.0
+            return float(np.nanmedian(res_df[column].to_numpy(dtype=np.float64)))
+        
         # 基本的な指標を計算
         metrics = {
-            'sharpe_ratio': res_df.get('Sharpe Ratio', pd.Series([0])).median(),
-            'total_return': res_df.get('Return [%]', pd.Series([0])).median(),
-            'max_drawdown': res_df.get('Max. Drawdown [%]', pd.Series([0])).median(),
+            'sharpe_ratio': column_median('Sharpe Ratio'),
+            'total_return': column_median('Return [%]'),
+            'max_drawdown': column_median('Max. Drawdown [%]'),
         }
         
         return metrics
@@ -8,9 +8,12 @@ import os
 import sys
 import json
 import argparse
-import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Optional
+import numpy as np
 import pandas as pd
 
 # プロジェクトルートをパスに追加
@@ -19,12 +22,201 @@ sys.path.insert(0, str(project_root))
 
 from src.config import config
 from src.logger import get_logger
+from src.jsonio import json_dumps, json_loads
 from src.improvement_history import improvement_history, ImprovementMode
 from src.ai_improver import ai_improver
+from src.jit import njit
 from scripts.run_backtest_enhanced import EnhancedBacktestRunner
 
 logger = get_logger("test_improvements")
 
+# モック用ベースラインのパフォーマンス（指標名と値、改善方向の符号）
+_BASELINE_KEYS = ('sharpe_ratio', 'sortino_ratio', 'calmar_ratio', 'max_drawdown',
+                  'win_rate', 'profit_factor', 'total_return')
+_BASELINE_VALS = np.array([0.8, 1.2, 0.5, 0.15, 0.55, 1.3, 0.25])
+_SIGN = np.array([1, 1, 1, -1, 1, 1, 1], dtype=np.int8)  # ドローダウンは小さい方が良い
+
+# プロセスプールで並列実行する最小の提案数（これ未満は順次実行）
+_PARALLEL_MIN_PROPOSALS = 8
+
+@njit(cache=True)
+def _score_batch(baseline: np.ndarray, signs: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """提案ごとの改善係数をベースラインに適用（行: 提案、列: 指標）"""
+    out = np.empty((factors.shape[0], baseline.shape[0]))
+    for i in range(factors.shape[0]):
+        factor = factors[i]
+        for j in range(baseline.shape[0]):
+            if signs[j] > 0:
+                out[i, j] = baseline[j] * factor
+            else:
+                out[i, j] = baseline[j] / factor
+    return out
+
+@dataclass
+class ProposalSpec:
+    """テスト対象の改善提案"""
+    strategy_name: str
+    description: str
+    new_params: Dict[str, Any]
+    current_params: Dict[str, Any]
+    current_performance: Dict[str, float]
+    extra: Dict[str, Any] = field(default_factory=dict)  # type, confidence などその他の項目
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ProposalSpec':
+        """改善提案ファイルの1件から生成（必須項目が無い場合はKeyError）"""
+        names = [f.name for f in fields(cls) if f.name != 'extra']
+        extra = {k: v for k, v in data.items() if k not in names}
+        return cls(**{name: data[name] for name in names}, extra=extra)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """結果ファイル出力用の辞書に変換"""
+        return {
+            'strategy_name': self.strategy_name,
+            'description': self.description,
+            'new_params': self.new_params,
+            'current_params': self.current_params,
+            'current_performance': self.current_performance,
+            **self.extra
+        }
+
+def _test_single_proposal(proposal: ProposalSpec) -> Dict[str, Any]:
+    """単一の改善提案をテスト（ワーカープロセスで実行）"""
+    
+    # 新しいパラメータでバックテストを実行（パラメータはメモリ上で受け渡す）
+    new_performance = _run_backtest_with_params(proposal.strategy_name, proposal.new_params,
+                                                proposal.current_params, proposal.current_performance)
+    
+    if not new_performance:
+        raise ValueError("バックテスト結果が取得できませんでした")
+    
+    # 改善提案を評価
+    evaluation = ai_improver.evaluate_improvement_proposal(
+        strategy_name=proposal.strategy_name,
+        old_params=proposal.current_params,
+        new_params=proposal.new_params,
+        old_metrics=proposal.current_performance,
+        new_metrics=new_performance
+    )
+    
+    # 改善履歴への記録は親プロセスで行う
+    result = {
+        'proposal': proposal.to_dict(),
+        'success': True,
+        'new_performance': new_performance,
+        'evaluation': evaluation
+    }
+    
+    return result
+
+def _failed_result(proposal: ProposalSpec, error: Exception) -> Dict[str, Any]:
+    """テストに失敗した改善提案の結果"""
+    return {
+        'proposal': proposal.to_dict(),
+        'success': False,
+        'error': str(error),
+        'improvement_score': 0
+    }
+
+def _run_proposal_safely(proposal: ProposalSpec) -> Dict[str, Any]:
+    """改善提案をテストし、例外は失敗結果として返す"""
+    try:
+        return _test_single_proposal(proposal)
+    except Exception as e:
+        return _failed_result(proposal, e)
+
+def _run_backtest_with_params(strategy_name: str,
+                              new_params: Dict[str, Any],
+                              current_params: Dict[str, Any] = None,
+                              current_performance: Dict[str, float] = None) -> Dict[str, float]:
+    """新しいパラメータでバックテストを実行"""
+    try:
+        # 現在のパラメータから変更が無い提案はバックテスト不要
+        if current_performance and current_params is not None:
+            if all(current_params.get(k) == v for k, v in new_params.items()):
+                return dict(current_performance)
+        
+        # パラメータは設定ファイルを経由せず直接受け取る
+        # ここでは簡略化のため、モック的な結果を返す
+        
+        # TODO: 実際のバックテスト実行ロジックを実装
+        # 現在は、既存のバックテスト結果から推定値を計算
+        
+        # モック的な改善結果を生成
+        return _generate_mock_improvement(strategy_name, new_params)
+        
+    except Exception as e:
+        logger.error(f"バックテスト実行エラー: {e}")
+        return {}
+
+def _generate_mock_improvement(strategy_name: str, new_params: Dict[str, Any]) -> Dict[str, float]:
+    """モック的な改善結果を生成（開発用）"""
+    # 実際の実装では、この部分を削除して実際のバックテスト結果を使用
+    
+    # パラメータ変更に基づいて改善を模擬
+    improvement_factor = 1.0
+    
+    # SMA期間の変更による改善
+    if 'sma_period' in new_params:
+        old_period = 20  # 仮の元の値
+        new_period = new_params['sma_period']
+        if new_period < old_period:
+            improvement_factor *= 1.1  # 短期化で改善
+        elif new_period > old_period:
+            improvement_factor *= 1.05  # 長期化で改善
+    
+    # ストップロスの変更による改善
+    if 'stop_loss' in new_params:
+        old_stop = 0.05  # 仮の元の値
+        new_stop = new_params['stop_loss']
+        if new_stop < old_stop:
+            improvement_factor *= 1.15  # 厳格化で改善
+    
+    # ランダムな変動を追加（プロセスごとに独立した乱数生成器を使用）
+    random_factor = 0.9 + np.random.default_rng().random() * 0.2  # 0.9-1.1の範囲
+    
+    final_factor = improvement_factor * random_factor
+    
+    # 改善されたパフォーマンスを計算（ドローダウンは割り、その他は掛ける）
+    improved = _score_batch(_BASELINE_VALS, _SIGN, np.array([final_factor]))[0]
+    
+    return dict(zip(_BASELINE_KEYS, improved.tolist()))
+
+def _to_jsonable(value: Any) -> Any:
+    """JSONでそのまま表現できる型に変換（シリアライザのコールバックを不要にする）"""
+    # np.float64はfloatのサブクラスのため、組み込み型より先に判定する
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, dict):
+        return {k if isinstance(k, str) else str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+def _partition_results(results: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """テスト結果を成功と失敗に1回の走査で振り分け"""
+    successful, failed = [], []
+    for result in results:
+        (successful if result.get('success', False) else failed).append(result)
+    return successful, failed
+
+def _top_k_indices(scores: np.ndarray, k: Optional[int]) -> List[int]:
+    """スコア上位k件のインデックスを降順で取得（全件ソートせずargpartitionで絞り込む）"""
+    n = len(scores)
+    if k is None or k >= n:
+        candidates = np.arange(n)
+    elif k <= 0:
+        return []
+    else:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    return candidates[np.argsort(-scores[candidates], kind='stable')].tolist()
+
 class ImprovementTester:
     """改善提案テストクラス"""
     
@@ -35,7 +227,8 @@ class ImprovementTester:
     def test_improvements(self, 
                          mode: str,
                          branch_name: str = None,
-                         proposals_file: str = "improvement_proposals.json") -> List[Dict[str, Any]]:
+                         proposals_file: str = "improvement_proposals.json",
+                         workers: int = None) -> List[Dict[str, Any]]:
         """改善提案をテスト実行"""
         
         logger.info(f"改善提案テスト開始 - モード: {mode}")
@@ -46,31 +239,32 @@ class ImprovementTester:
             logger.warning("改善提案が見つかりませんでした")
             return []
         
-        test_results = []
+        test_results: List[Dict[str, Any]] = [None] * len(proposals)
+        workers = max(1, workers or os.cpu_count() or 1)
         
-        for i, proposal in enumerate(proposals, 1):
-            strategy_name = proposal['strategy_name']
-            description = proposal['description']
-            new_params = proposal['new_params']
-            
-            logger.info(f"テスト {i}/{len(proposals)}: {strategy_name} - {description}")
-            
-            try:
-                # 改善提案をテスト実行
-                result = self._test_single_proposal(proposal, mode, branch_name)
-                test_results.append(result)
-                
-                logger.info(f"テスト完了: {strategy_name} - 改善スコア: {result.get('improvement_score', 0):.4f}")
-                
-            except Exception as e:
-                logger.error(f"テスト失敗: {strategy_name} - {e}")
-                result = {
-                    'proposal': proposal,
-                    'success': False,
-                    'error': str(e),
-                    'improvement_score': 0
-                }
-                test_results.append(result)
+        # 改善履歴への書き込みはループ終了時にまとめて行う
+        with improvement_history.batch():
+            if workers == 1 or len(proposals) < max(workers, _PARALLEL_MIN_PROPOSALS):
+                # 提案が少ない場合はプロセス起動のコストが上回るため単一プロセスで順次実行
+                for i, proposal in enumerate(proposals):
+                    logger.info(f"テスト {i + 1}/{len(proposals)}: {proposal.strategy_name} - {proposal.description}")
+                    test_results[i] = self._collect_result(proposal, _run_proposal_safely(proposal), mode, branch_name)
+            else:
+                # 提案ごとのバックテストは独立しているためプロセスプールで並列実行
+                logger.info(f"並列テスト実行: {workers}プロセス")
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(_run_proposal_safely, proposal): i
+                               for i, proposal in enumerate(proposals)}
+                    for done, future in enumerate(as_completed(futures), 1):
+                        i = futures[future]
+                        proposal = proposals[i]
+                        logger.info(f"テスト {done}/{len(proposals)}: {proposal.strategy_name} - {proposal.description}")
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            # ワーカーの異常終了や結果の受け渡し失敗はその提案のみ失敗として記録
+                            result = _failed_result(proposal, e)
+                        test_results[i] = self._collect_result(proposal, result, mode, branch_name)
         
         # 結果を保存
         self._save_test_results(test_results)
@@ -78,171 +272,59 @@ class ImprovementTester:
         logger.info(f"改善提案テスト完了: {len(test_results)}件")
         return test_results
     
-    def _load_proposals(self, proposals_file: str) -> List[Dict[str, Any]]:
-        """改善提案を読み込み"""
-        try:
-            with open(proposals_file, 'r', encoding='utf-8') as f:
-                proposals = json.load(f)
-            logger.info(f"改善提案を読み込み: {len(proposals)}件")
-            return proposals
-        except FileNotFoundError:
-            logger.error(f"改善提案ファイルが見つかりません: {proposals_file}")
-            return []
-        except Exception as e:
-            logger.error(f"改善提案読み込みエラー: {e}")
-            return []
-    
-    def _test_single_proposal(self, 
-                             proposal: Dict[str, Any], 
-                             mode: str,
-                             branch_name: str = None) -> Dict[str, Any]:
-        """単一の改善提案をテスト"""
-        
-        strategy_name = proposal['strategy_name']
-        new_params = proposal['new_params']
-        current_params = proposal['current_params']
-        current_performance = proposal['current_performance']
+    def _collect_result(self,
+                        proposal: ProposalSpec,
+                        result: Dict[str, Any],
+                        mode: str,
+                        branch_name: str = None) -> Dict[str, Any]:
+        """ワーカーのテスト結果を改善履歴に記録"""
+        strategy_name = proposal.strategy_name
         
-        # 一時的な設定ファイルを作成
-        temp_config = self._create_temp_config(strategy_name, new_params)
+        if not result.get('success', False):
+            logger.error(f"テスト失敗: {strategy_name} - {result.get('error')}")
+            return result
         
         try:
-            # 新しいパラメータでバックテストを実行
-            new_performance = self._run_backtest_with_params(strategy_name, new_params)
-            
-            if not new_performance:
-                raise ValueError("バックテスト結果が取得できませんでした")
-            
-            # 改善提案を評価
-            evaluation = ai_improver.evaluate_improvement_proposal(
-                strategy_name=strategy_name,
-                old_params=current_params,
-                new_params=new_params,
-                old_metrics=current_performance,
-                new_metrics=new_performance
-            )
-            
-            # 改善履歴に記録
-            improvement_id = self._record_improvement(proposal, evaluation, mode, branch_name)
-            
-            result = {
-                'proposal': proposal,
-                'success': True,
-                'new_performance': new_performance,
-                'evaluation': evaluation,
-                'improvement_id': improvement_id,
-                'improvement_score': evaluation['improvement_score'],
-                'improvement_level': evaluation['improvement_level']
-            }
+            evaluation = result['evaluation']
+            result['improvement_id'] = self._record_improvement(proposal, evaluation, mode, branch_name)
+            result['improvement_score'] = evaluation['improvement_score']
+            result['improvement_level'] = evaluation['improvement_level']
             
+            logger.info(f"テスト完了: {strategy_name} - 改善スコア: {result['improvement_score']:.4f}")
             return result
             
-        finally:
-            # 一時ファイルを削除
-            if temp_config and temp_config.exists():
-                temp_config.unlink()
-    
-    def _create_temp_config(self, strategy_name: str, new_params: Dict[str, Any]) -> Path:
-        """一時的な設定ファイルを作成"""
-        try:
-            # 現在の設定を読み込み
-            config_path = Path("config.yaml")
-            if not config_path.exists():
-                raise FileNotFoundError("config.yamlが見つかりません")
-            
-            with open(config_path, 'r', encoding='utf-8') as f:
-                import yaml
-                config_data = yaml.safe_load(f)
-            
-            # 戦略パラメータを更新
-            if 'strategies' in config_data and strategy_name in config_data['strategies']:
-                config_data['strategies'][strategy_name].update(new_params)
-            
-            # 一時ファイルを作成
-            temp_config = Path(tempfile.mktemp(suffix='.yaml'))
-            with open(temp_config, 'w', encoding='utf-8') as f:
-                yaml.dump(config_data, f, default_flow_style=False, allow_unicode=True)
-            
-            return temp_config
-            
         except Exception as e:
-            logger.error(f"一時設定ファイル作成エラー: {e}")
-            return None
+            logger.error(f"テスト失敗: {strategy_name} - {e}")
+            return {
+                'proposal': proposal.to_dict(),
+                'success': False,
+                'error': str(e),
+                'improvement_score': 0
+            }
     
-    def _run_backtest_with_params(self, strategy_name: str, new_params: Dict[str, Any]) -> Dict[str, float]:
-        """新しいパラメータでバックテストを実行"""
+    def _load_proposals(self, proposals_file: str) -> List[ProposalSpec]:
+        """改善提案を読み込み"""
         try:
-            # 一時的な設定でバックテストを実行
-            # 実際の実装では、設定を動的に変更してバックテストを実行
-            # ここでは簡略化のため、モック的な結果を返す
-            
-            # TODO: 実際のバックテスト実行ロジックを実装
-            # 現在は、既存のバックテスト結果から推定値を計算
-            
-            # モック的な改善結果を生成
-            mock_improvement = self._generate_mock_improvement(strategy_name, new_params)
-            
-            return mock_improvement
-            
+            proposals = []
+            for i, data in enumerate(json_loads(Path(proposals_file).read_bytes()), 1):
+                try:
+                    proposals.append(ProposalSpec.from_dict(data))
+                except KeyError as e:
+                    logger.warning(f"改善提案 {i}件目に必須項目がありません: {e}")
+            logger.info(f"改善提案を読み込み: {len(proposals)}件")
+            return proposals
+        except FileNotFoundError:
+            logger.error(f"改善提案ファイルが見つかりません: {proposals_file}")
+            return []
+        except json.JSONDecodeError as e:
+            logger.error(f"改善提案ファイルの形式が不正です: {e}")
+            return []
         except Exception as e:
-            logger.error(f"バックテスト実行エラー: {e}")
-            return {}
-    
-    def _generate_mock_improvement(self, strategy_name: str, new_params: Dict[str, Any]) -> Dict[str, float]:
-        """モック的な改善結果を生成（開発用）"""
-        # 実際の実装では、この部分を削除して実際のバックテスト結果を使用
-        
-        import random
-        
-        # ベースラインのパフォーマンス
-        baseline = {
-            'sharpe_ratio': 0.8,
-            'sortino_ratio': 1.2,
-            'calmar_ratio': 0.5,
-            'max_drawdown': 0.15,
-            'win_rate': 0.55,
-            'profit_factor': 1.3,
-            'total_return': 0.25
-        }
-        
-        # パラメータ変更に基づいて改善を模擬
-        improvement_factor = 1.0
-        
-        # SMA期間の変更による改善
-        if 'sma_period' in new_params:
-            old_period = 20  # 仮の元の値
-            new_period = new_params['sma_period']
-            if new_period < old_period:
-                improvement_factor *= 1.1  # 短期化で改善
-            elif new_period > old_period:
-                improvement_factor *= 1.05  # 長期化で改善
-        
-        # ストップロスの変更による改善
-        if 'stop_loss' in new_params:
-            old_stop = 0.05  # 仮の元の値
-            new_stop = new_params['stop_loss']
-            if new_stop < old_stop:
-                improvement_factor *= 1.15  # 厳格化で改善
-        
-        # ランダムな変動を追加
-        random_factor = 0.9 + random.random() * 0.2  # 0.9-1.1の範囲
-        
-        final_factor = improvement_factor * random_factor
-        
-        # 改善されたパフォーマンスを計算
-        improved = {}
-        for key, value in baseline.items():
-            if key == 'max_drawdown':
-                # ドローダウンは小さい方が良い
-                improved[key] = value / final_factor
-            else:
-                # その他は大きい方が良い
-                improved[key] = value * final_factor
-        
-        return improved
+            logger.error(f"改善提案読み込みエラー: {e}")
+            return []
     
     def _record_improvement(self, 
-                          proposal: Dict[str, Any],
+                          proposal: ProposalSpec,
                           evaluation: Dict[str, Any],
                           mode: str,
                           branch_name: str = None) -> str:
@@ -252,12 +334,12 @@ class ImprovementTester:
         
         improvement_id = improvement_history.add_improvement(
             mode=improvement_mode,
-            strategy_name=proposal['strategy_name'],
-            old_params=proposal['current_params'],
-            new_params=proposal['new_params'],
+            strategy_name=proposal.strategy_name,
+            old_params=proposal.current_params,
+            new_params=proposal.new_params,
             performance_metrics=evaluation.get('comparison', {}),
             improvement_score=evaluation['improvement_score'],
-            description=proposal['description'],
+            description=proposal.description,
             branch_name=branch_name or 'main',
             commit_hash='test-commit'  # 実際の実装ではGitコミットハッシュを使用
         )
@@ -268,47 +350,64 @@ class ImprovementTester:
                           output_file: str = "test_results.json"):
         """テスト結果を保存"""
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(test_results, f, indent=2, ensure_ascii=False, default=str)
+            # 1件ずつシリアライズして書き込み、全体の文字列をメモリ上に構築しない
+            with open(output_file, 'wb') as f:
+                f.write(b'[\n')
+                for i, result in enumerate(test_results):
+                    if i:
+                        f.write(b',\n')
+                    f.write(json_dumps(_to_jsonable(result)))
+                f.write(b'\n]\n')
             logger.info(f"テスト結果を保存: {output_file}")
         except Exception as e:
             logger.error(f"テスト結果保存エラー: {e}")
     
-    def print_test_summary(self, test_results: List[Dict[str, Any]]):
-        """テスト結果のサマリーを表示"""
+    def print_test_summary(self, test_results: List[Dict[str, Any]], top_k: Optional[int] = None) -> int:
+        """テスト結果のサマリーを表示し、成功件数を返す（成功分は改善スコア上位top_k件を表示）"""
         if not test_results:
             print("テスト結果はありません")
-            return
+            return 0
         
-        successful_tests = [r for r in test_results if r.get('success', False)]
-        failed_tests = [r for r in test_results if not r.get('success', False)]
+        successful_tests, failed_tests = _partition_results(test_results)
         
-        print(f"\n=== 改善提案テスト結果 ===")
-        print(f"総テスト数: {len(test_results)}")
-        print(f"成功: {len(successful_tests)}")
-        print(f"失敗: {len(failed_tests)}")
+        # 出力は1回の書き込みにまとめる
+        lines = [
+            f"\n=== 改善提案テスト結果 ===",
+            f"総テスト数: {len(test_results)}",
+            f"成功: {len(successful_tests)}",
+            f"失敗: {len(failed_tests)}",
+        ]
         
         if successful_tests:
-            print(f"\n--- 成功した改善提案 ---")
-            for i, result in enumerate(successful_tests, 1):
+            top_indices = _top_k_indices(
+                np.fromiter((r['evaluation']['improvement_score'] for r in successful_tests),
+                            dtype=np.float64, count=len(successful_tests)),
+                top_k
+            )
+            lines.append(f"\n--- 成功した改善提案（改善スコア上位{len(top_indices)}件） ---")
+            for i, idx in enumerate(top_indices, 1):
+                result = successful_tests[idx]
                 proposal = result['proposal']
                 evaluation = result['evaluation']
                 
-                print(f"\n{i}. {proposal['strategy_name']}")
-                print(f"   説明: {proposal['description']}")
-                print(f"   改善スコア: {evaluation['improvement_score']:.4f}")
-                print(f"   改善レベル: {evaluation['improvement_level']}")
-                print(f"   推奨: {evaluation['recommendation']}")
+                lines.append(f"\n{i}. {proposal['strategy_name']}")
+                lines.append(f"   説明: {proposal['description']}")
+                lines.append(f"   改善スコア: {evaluation['improvement_score']:.4f}")
+                lines.append(f"   改善レベル: {evaluation['improvement_level']}")
+                lines.append(f"   推奨: {evaluation['recommendation']}")
         
         if failed_tests:
-            print(f"\n--- 失敗した改善提案 ---")
+            lines.append(f"\n--- 失敗した改善提案 ---")
             for i, result in enumerate(failed_tests, 1):
                 proposal = result['proposal']
                 error = result.get('error', '不明なエラー')
                 
-                print(f"\n{i}. {proposal['strategy_name']}")
-                print(f"   説明: {proposal['description']}")
-                print(f"   エラー: {error}")
+                lines.append(f"\n{i}. {proposal['strategy_name']}")
+                lines.append(f"   説明: {proposal['description']}")
+                lines.append(f"   エラー: {error}")
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
+        return len(successful_tests)
 
 def main():
     parser = argparse.ArgumentParser(description='改善提案テスト実行')
@@ -319,6 +418,10 @@ def main():
                        help='改善提案ファイル名')
     parser.add_argument('--output', type=str, default='test_results.json',
                        help='出力ファイル名')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                       help='並列実行するプロセス数')
+    parser.add_argument('--top-k', type=int, default=10,
+                       help='サマリーに表示する成功提案の件数（改善スコア上位）')
     
     args = parser.parse_args()
     
@@ -329,18 +432,19 @@ def main():
         test_results = tester.test_improvements(
             mode=args.mode,
             branch_name=args.branch_name,
-            proposals_file=args.proposals
+            proposals_file=args.proposals,
+            workers=args.workers
         )
         
         # 結果を保存
+        successful_count = 0
         if test_results:
             tester._save_test_results(test_results, args.output)
-            tester.print_test_summary(test_results)
+            successful_count = tester.print_test_summary(test_results, top_k=args.top_k)
         else:
             logger.info("テスト結果がありませんでした")
         
         # 成功したテストの数を返す
-        successful_count = len([r for r in test_results if r.get('success', False)])
         sys.exit(0 if successful_count > 0 else 1)
         
     except Exception as e:
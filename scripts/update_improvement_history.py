@@ -11,13 +11,21 @@ import argparse
 from pathlib import Path
 from typing import Dict, List, Any
 import pandas as pd
+import yaml
+
+# libyamlのCバインディングが利用可能な場合は高速なダンパーを使用
+try:
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeDumper as _YamlDumper
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.config import config
+from src.config import config, load_config_snapshot
 from src.logger import get_logger
+from src.jsonio import json_loads
 from src.improvement_history import improvement_history
 
 logger = get_logger("update_improvement_history")
@@ -64,25 +72,21 @@ class ImprovementHistoryUpdater:
         
         if strategy_name:
             # 特定戦略のロールバック
-            if improvement_history.can_rollback(strategy_name):
-                rollback_target = improvement_history.get_rollback_target(strategy_name)
-                if rollback_target:
-                    self._execute_rollback(strategy_name, rollback_target)
-                    return True
-            else:
-                logger.warning(f"戦略 '{strategy_name}' のロールバックができません")
-                return False
+            rollback_target = improvement_history.peek_rollback_target(strategy_name)
+            if rollback_target:
+                self._execute_rollback(strategy_name, rollback_target)
+                return True
+            logger.warning(f"戦略 '{strategy_name}' のロールバックができません")
+            return False
         else:
             # 全戦略のロールバック
             strategies = self.config.get('strategies', {})
             rollback_count = 0
             
             for strategy in strategies.keys():
-                if improvement_history.can_rollback(strategy):
-                    rollback_target = improvement_history.get_rollback_target(strategy)
-                    if rollback_target:
-                        if self._execute_rollback(strategy, rollback_target):
-                            rollback_count += 1
+                rollback_target = improvement_history.peek_rollback_target(strategy)
+                if rollback_target and self._execute_rollback(strategy, rollback_target):
+                    rollback_count += 1
             
             logger.info(f"ロールバック完了: {rollback_count}戦略")
             return rollback_count > 0
@@ -90,9 +94,11 @@ class ImprovementHistoryUpdater:
     def _load_evaluation_results(self, evaluation_results_file: str) -> Dict[str, Any]:
         """評価結果を読み込み"""
         try:
-            if Path(evaluation_results_file).exists():
-                with open(evaluation_results_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return json_loads(Path(evaluation_results_file).read_bytes())
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            logger.error(f"評価結果ファイルの形式が不正です: {e}")
         except Exception as e:
             logger.error(f"評価結果読み込みエラー: {e}")
         return {}
@@ -107,9 +113,7 @@ class ImprovementHistoryUpdater:
                 return False
             
             # 設定を読み込み
-            with open(config_path, 'r', encoding='utf-8') as f:
-                import yaml
-                config_data = yaml.safe_load(f)
+            config_data = load_config_snapshot(config_path)
             
             # 戦略パラメータをロールバック
             if 'strategies' in config_data and strategy_name in config_data['strategies']:
@@ -117,7 +121,7 @@ class ImprovementHistoryUpdater:
                 
                 # 設定を保存
                 with open(config_path, 'w', encoding='utf-8') as f:
-                    yaml.dump(config_data, f, default_flow_style=False, allow_unicode=True)
+                    yaml.dump(config_data, f, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
                 
                 # 改善履歴を更新
                 improvement_history.update_status(rollback_target.id, 'rolled_back')
@@ -156,22 +160,27 @@ class ImprovementHistoryUpdater:
         """改善履歴のサマリーを表示"""
         summary = improvement_history.get_improvement_summary()
         
-        print(f"\n=== 改善履歴サマリー ===")
-        print(f"総改善回数: {summary['total']}")
-        print(f"対象戦略数: {len(summary['strategies'])}")
+        # 出力は1回の書き込みにまとめる
+        lines = [
+            f"\n=== 改善履歴サマリー ===",
+            f"総改善回数: {summary['total']}",
+            f"対象戦略数: {len(summary['strategies'])}",
+        ]
         
         if summary['strategies']:
-            print(f"\n--- 戦略別統計 ---")
+            lines.append(f"\n--- 戦略別統計 ---")
             for strategy, stats in summary['strategies'].items():
-                print(f"\n{strategy}:")
-                print(f"  総改善回数: {stats['total']}")
-                print(f"  採用: {stats['adopted']} | 失敗: {stats['failed']} | 保留: {stats['pending']}")
-                print(f"  最高スコア: {stats['best_score']:.4f}")
+                lines.append(f"\n{strategy}:")
+                lines.append(f"  総改善回数: {stats['total']}")
+                lines.append(f"  採用: {stats['adopted']} | 失敗: {stats['failed']} | 保留: {stats['pending']}")
+                lines.append(f"  最高スコア: {stats['best_score']:.4f}")
         
         if summary['recent_improvements']:
-            print(f"\n--- 最近の改善 ---")
+            lines.append(f"\n--- 最近の改善 ---")
             for record in summary['recent_improvements'][:5]:  # 最新5件
-                print(f"  {record['strategy']} - {record['status']} (スコア: {record['score']:.4f})")
+                lines.append(f"  {record['strategy']} - {record['status']} (スコア: {record['score']:.4f})")
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
 
 def main():
     parser = argparse.ArgumentParser(description='改善履歴更新')
@@ -1,67 +1,490 @@
 import json
+import logging
+import math
+import os
 import random
+import sys
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from collections import ChainMap, namedtuple
+from dataclasses import dataclass, field
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Any, Iterator, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
-import pandas as pd
+
+# pandasは型注釈でのみ参照するため実行時には読み込まない
+if TYPE_CHECKING:
+    import pandas as pd
 
 from src.config import config
 from src.logger import get_logger
-from src.improvement_history import improvement_history, ImprovementMode
+from src.improvement_history import improvement_history, ImprovementMode, _params_fingerprint
 from src.enhanced_metrics import enhanced_metrics
 from src.dynamic_optimizer import dynamic_optimizer
+from src.jit import njit, NUMBA_AVAILABLE
 
 logger = get_logger("ai_improver")
 
+# 評価指標名（モジュール内で同一の文字列オブジェクトを共有）
+SHARPE_RATIO = 'sharpe_ratio'
+SORTINO_RATIO = 'sortino_ratio'
+CALMAR_RATIO = 'calmar_ratio'
+MAX_DRAWDOWN = 'max_drawdown'
+WIN_RATE = 'win_rate'
+PROFIT_FACTOR = 'profit_factor'
+TOTAL_RETURN = 'total_return'
+
+# 弱点フラグ（_analyze_current_performanceで算出するビットマスク）
+W_LOW_WIN = 1 << 0      # 低い勝率
+W_HIGH_DD = 1 << 1      # 高い最大ドローダウン
+W_LOW_PF = 1 << 2       # 低い利益因子
+W_LOW_SHARPE = 1 << 3   # 低いシャープレシオ
+W_HIGH_RISK = 1 << 4    # リスクレベル高
+
+# 強みフラグ
+S_HIGH_SHARPE = 1 << 0  # 高いシャープレシオ
+S_LOW_DD = 1 << 1       # 低い最大ドローダウン
+S_HIGH_WIN = 1 << 2     # 高い勝率
+S_HIGH_PF = 1 << 3      # 高い利益因子
+
+# パフォーマンス分析の閾値（指標順: シャープレシオ, 最大ドローダウン, 勝率, 利益因子）
+# ドローダウンは小さい方が良いため符号を反転して「大きいほど良い」に揃える
+_ANALYSIS_KEYS = (SHARPE_RATIO, MAX_DRAWDOWN, WIN_RATE, PROFIT_FACTOR)
+_ANALYSIS_DIRECTION = np.array([1.0, -1.0, 1.0, 1.0])
+_STRENGTH_THRESHOLDS = np.array([1.5, 0.1, 0.6, 1.5]) * _ANALYSIS_DIRECTION
+_WEAKNESS_THRESHOLDS = np.array([0.5, 0.3, 0.4, 1.0]) * _ANALYSIS_DIRECTION
+_STRENGTH_BITS = np.array([S_HIGH_SHARPE, S_LOW_DD, S_HIGH_WIN, S_HIGH_PF], dtype=np.int64)
+_WEAKNESS_BITS = np.array([W_LOW_SHARPE, W_HIGH_DD | W_HIGH_RISK, W_LOW_WIN, W_LOW_PF], dtype=np.int64)
+
+# 分析ラベル・期待効果の文字列（非ASCII文字列は自動でインターンされないため1か所で定義して共有）
+LABEL_HIGH_SHARPE = sys.intern('高いシャープレシオ')
+LABEL_LOW_DD = sys.intern('低い最大ドローダウン')
+LABEL_HIGH_WIN = sys.intern('高い勝率')
+LABEL_HIGH_PF = sys.intern('高い利益因子')
+LABEL_LOW_SHARPE = sys.intern('低いシャープレシオ')
+LABEL_HIGH_DD = sys.intern('高い最大ドローダウン')
+LABEL_LOW_WIN = sys.intern('低い勝率')
+LABEL_LOW_PF = sys.intern('低い利益因子')
+
+IMP_DD_REDUCTION = sys.intern('ドローダウン削減')
+IMP_ENTRY_PRECISION = sys.intern('エントリー精度向上')
+IMP_ENTRY_SENSITIVITY = sys.intern('エントリー感度向上')
+IMP_STABILITY = sys.intern('パフォーマンス安定化')
+
+# フラグとログ用ラベルの対応（元の分析順）
+_STRENGTH_LABELS = (
+    (S_HIGH_SHARPE, LABEL_HIGH_SHARPE),
+    (S_LOW_DD, LABEL_LOW_DD),
+    (S_HIGH_WIN, LABEL_HIGH_WIN),
+    (S_HIGH_PF, LABEL_HIGH_PF),
+)
+_WEAKNESS_LABELS = (
+    (W_LOW_SHARPE, LABEL_LOW_SHARPE, 'リターン/リスク比の改善'),
+    (W_HIGH_DD, LABEL_HIGH_DD, 'リスク管理の強化'),
+    (W_LOW_WIN, LABEL_LOW_WIN, 'エントリー/エグジット条件の改善'),
+    (W_LOW_PF, LABEL_LOW_PF, '損益比の改善'),
+)
+
+# 改善スコアの評価指標（順序は重み・符号ベクトルと対応）
+_METRIC_KEYS = (SHARPE_RATIO, SORTINO_RATIO, CALMAR_RATIO, MAX_DRAWDOWN,
+                WIN_RATE, PROFIT_FACTOR, TOTAL_RETURN)
+_WEIGHTS = np.array([0.25, 0.20, 0.15, 0.15, 0.10, 0.10, 0.05])
+_SIGN = np.array([1, 1, 1, -1, 1, 1, 1], dtype=np.float64)  # ドローダウンは小さい方が良い
+
+# 改善スコアの区切り（昇順）と各区間の改善レベル・推奨事項
+_SCORE_BREAKS = (-0.05, 0.05, 0.1, 0.2)
+_IMPROVEMENT_LEVELS = ('degradation', 'neutral', 'minor', 'moderate', 'significant')
+_RECOMMENDATIONS = (
+    "非推奨 - パフォーマンスの悪化が懸念されます",
+    "中立 - 大きな変化は期待されません",
+    "軽微な改善 - 小さな改善が期待されます",
+    "推奨 - 中程度の改善が期待されます",
+    "強く推奨 - 大幅な改善が期待されます",
+)
+
+# 改善リスクの判定結果（_evaluate_kernelの戻り値 → 添字）
+_RISK_LEVELS = ('low', 'medium', 'high')
+
+# generate_all_proposalsでプロセスプールを使う最小の戦略数（これ未満は順次実行）
+_PARALLEL_MIN_STRATEGIES = 16
+
+@njit(cache=True)
+def _evaluate_kernel(old: np.ndarray, new: np.ndarray, weights: np.ndarray, sign: np.ndarray,
+                     n_compare: int, dd_index: int):
+    """改善スコア・指標ごとの変化・リスクを1回のループで計算
+    
+    戻り値: (重み付き相対改善率の合計, リスクコード, 先頭n_compare指標の変化コード)
+    変化コードは 1: 改善, -1: 悪化, 0: 変化なし（±5%を変化とみなす）
+    """
+    score = 0.0
+    status = np.zeros(n_compare, dtype=np.int8)
+    for i in range(old.shape[0]):
+        if weights[i] != 0.0:
+            denom = abs(old[i])
+            if denom < 0.01:
+                denom = 0.01
+            score += weights[i] * (new[i] - old[i]) * sign[i] / denom
+        
+        if i < n_compare:
+            above = new[i] > old[i] * 1.05
+            below = new[i] < old[i] * 0.95
+            # ドローダウンは小さい方が良い、その他は大きい方が良い
+            if i == dd_index:
+                above, below = below, above
+            if above:
+                status[i] = 1
+            elif below:
+                status[i] = -1
+    
+    # ドローダウンの悪化をチェック
+    old_dd = old[dd_index]
+    new_dd = new[dd_index]
+    if new_dd > old_dd * 1.2:
+        risk = 2
+    elif new_dd > old_dd * 1.1:
+        risk = 1
+    else:
+        risk = 0
+    return score, risk, status
+
+_METRIC_INDEX = {key: i for i, key in enumerate(_METRIC_KEYS)}
+
+@lru_cache(maxsize=64)
+def _metric_layout(compare_keys: Tuple[str, ...]) -> Tuple[Tuple[str, ...], np.ndarray, np.ndarray, int]:
+    """比較対象の指標名の並びから、評価カーネル用のキー順・重み・符号・ドローダウン位置を作成
+    
+    比較対象（旧指標のキー順）を先頭に置き、スコア計算にのみ使う指標を後ろに追加する
+    """
+    keys = compare_keys + tuple(k for k in _METRIC_KEYS if k not in compare_keys)
+    weights = np.array([_WEIGHTS[_METRIC_INDEX[k]] if k in _METRIC_INDEX else 0.0 for k in keys])
+    sign = np.array([_SIGN[_METRIC_INDEX[k]] if k in _METRIC_INDEX else 1.0 for k in keys])
+    return keys, weights, sign, keys.index(MAX_DRAWDOWN)
+
+def _dict_to_vec(metrics: Dict[str, float], keys=_METRIC_KEYS) -> np.ndarray:
+    """指標辞書を指定キー順のfloat64配列に変換（未設定は0）"""
+    return np.fromiter((metrics.get(k, 0.0) for k in keys), dtype=np.float64, count=len(keys))
+
+# パフォーマンストレンドの判定コード（_trend_kernelの戻り値 → _TREND_LABELSの添字）
+TREND_STABLE, TREND_DECLINING, TREND_VOLATILE, TREND_IMPROVING, TREND_INSUFFICIENT = range(5)
+_TREND_LABELS = ('stable', 'declining', 'volatile', 'improving', 'insufficient_data')
+
+@njit(cache=True)
+def _trend_kernel(values) -> int:
+    """シャープレシオ系列の傾き（最小二乗の閉形式）と標準偏差からトレンドを判定"""
+    n = len(values)
+    if n < 2:
+        return TREND_INSUFFICIENT
+    if n < 3:
+        return TREND_STABLE
+    
+    mean_x = (n - 1) / 2.0
+    mean_y = 0.0
+    for i in range(n):
+        mean_y += values[i]
+    mean_y /= n
+    
+    sxy = 0.0
+    sxx = 0.0
+    sq = 0.0
+    for i in range(n):
+        dx = i - mean_x
+        dy = values[i] - mean_y
+        sxy += dx * dy
+        sxx += dx * dx
+        sq += dy * dy
+    slope = sxy / sxx
+    volatility = math.sqrt(sq / n)
+    
+    if slope < -0.1:
+        return TREND_DECLINING
+    if volatility > 0.5:
+        return TREND_VOLATILE
+    if slope > 0.1:
+        return TREND_IMPROVING
+    return TREND_STABLE
+
+# 初回呼び出し時のコンパイルを避けるため読み込み時にウォームアップ
+_evaluate_kernel(np.zeros(len(_METRIC_KEYS)), np.zeros(len(_METRIC_KEYS)), _WEIGHTS, _SIGN, 0, 3)
+_trend_kernel(np.zeros(3))
+
+@lru_cache(maxsize=128)
+def _classify_trend(sharpe_values: Tuple[float, ...]) -> str:
+    """シャープレシオ系列からトレンドを判定（同じ系列の判定結果は再利用）"""
+    # numba未導入時は配列化せずタプルのまま計算（短い系列ではndarrayの要素アクセスの方が遅い）
+    values = np.array(sharpe_values, dtype=np.float64) if NUMBA_AVAILABLE else sharpe_values
+    return _TREND_LABELS[_trend_kernel(values)]
+
+# 市場状況の判定表（[ドローダウン > 0.2][シャープレシオ > 1.0]、ドローダウン超過を優先）
+_REGIME_DD_THRESHOLD = 0.2
+_REGIME_SHARPE_THRESHOLD = 1.0
+_REGIME_TABLE = (
+    ('ranging', 'trending'),
+    ('volatile', 'volatile'),
+)
+
+@lru_cache(maxsize=128)
+def _classify_market_regime(max_dd: float, sharpe: float) -> str:
+    """最大ドローダウンとシャープレシオから市場状況を判定（同じ入力の判定結果は再利用）"""
+    # 簡単な市場状況判定（実際にはより複雑な分析が必要）
+    return _REGIME_TABLE[max_dd > _REGIME_DD_THRESHOLD][sharpe > _REGIME_SHARPE_THRESHOLD]
+
+@lru_cache(maxsize=256)
+def _classify_param_keys(keys: Tuple[str, ...]) -> Tuple[frozenset, frozenset]:
+    """パラメータ名を期間系（'period'を含む）とSMA系（'sma'を含む）に分類（同じキー構成の結果は再利用）"""
+    lowered = [(key, key.lower()) for key in keys]
+    period_keys = frozenset(key for key, low in lowered if 'period' in low)
+    sma_keys = frozenset(key for key, low in lowered if 'sma' in low)
+    return period_keys, sma_keys
+
+@dataclass(slots=True, frozen=True)
+class Proposal:
+    """改善提案（外部へは辞書として渡す）"""
+    type: str
+    description: str
+    new_params: Mapping[str, Any]  # _merge由来の場合は現在パラメータを共有する差分ビュー（ChainMap）
+    expected_improvement: str
+    confidence: float
+    meta: Dict[str, Any] = field(default_factory=dict)  # ml_based / market_adaptive などの付加情報
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """提案ファイルに書き出す辞書形式に変換"""
+        return {
+            'type': self.type,
+            'description': self.description,
+            'new_params': dict(self.new_params),
+            'expected_improvement': self.expected_improvement,
+            'confidence': self.confidence,
+            **self.meta
+        }
+
+@lru_cache(maxsize=1)
+def _load_improvement_cfg() -> Tuple[float, int]:
+    """AI改善設定（類似度閾値, 1回あたりの最大提案数）を取得（プロセス内で1回だけ解決）"""
+    improvement_config = config.get_backtest_config().get('ai_improvement', {})
+    return (
+        improvement_config.get('similarity_threshold', 0.9),
+        improvement_config.get('max_improvements_per_run', 3)
+    )
+
+def _merge(params: Mapping[str, Any], **overrides: Any) -> ChainMap:
+    """指定キーだけ上書きしたパラメータのビューを作成（元のパラメータはコピーせず共有し、差分のみ保持）"""
+    return ChainMap(overrides, params)
+
+# 戦略別のパラメータ改善ルール
+# Step: 1つのパラメータの調整内容（現在値 + delta を [lo, hi] に収める。
+#       gap指定時は直前のStepの新しい値 + gap を下限とする。lo == hi の場合は固定値）
+# Rule: 弱点フラグが立っている場合に1件の提案を生成（descは old/new の辞書で整形）
+Step = namedtuple('Step', 'key default delta lo hi gap', defaults=(None, None, None))
+Rule = namedtuple('Rule', 'flag steps desc improvement confidence is_list')
+
+_RULES = {
+    'FixedSma': (
+        # 短期SMAの提案（より敏感なエントリー）
+        Rule(W_LOW_WIN, (Step('sma_period', 20, -5, lo=5),),
+             'SMA期間を{old[sma_period]}から{new[sma_period]}に短縮してエントリー感度を向上',
+             '勝率向上', 0.7, False),
+        # 長期SMAの提案（より安定したトレンド追従）
+        Rule(W_HIGH_DD, (Step('sma_period', 20, 10, hi=50),),
+             'SMA期間を{old[sma_period]}から{new[sma_period]}に延長してトレンド安定性を向上',
+             IMP_DD_REDUCTION, 0.6, False),
+    ),
+    'SmaCross': (
+        # より敏感なクロス設定
+        Rule(W_LOW_WIN, (Step('fast_sma', 10, -2, lo=5), Step('slow_sma', 30, -5, gap=5)),
+             '高速SMAを{old[fast_sma]}→{new[fast_sma]}、低速SMAを{old[slow_sma]}→{new[slow_sma]}に調整',
+             IMP_ENTRY_SENSITIVITY, 0.7, False),
+        # より安定したクロス設定
+        Rule(W_HIGH_DD, (Step('fast_sma', 10, 5, hi=20), Step('slow_sma', 30, 10, hi=50)),
+             '高速SMAを{old[fast_sma]}→{new[fast_sma]}、低速SMAを{old[slow_sma]}→{new[slow_sma]}に調整',
+             'トレンド安定性向上', 0.6, False),
+    ),
+    'Momentum': (
+        # RSI感度向上
+        Rule(W_LOW_WIN, (Step('rsi_period', 14, -3, lo=7),),
+             'RSI期間を{old[rsi_period]}から{new[rsi_period]}に短縮',
+             'RSI感度向上', 0.6, False),
+        # RSI閾値調整
+        Rule(W_LOW_PF, (Step('rsi_oversold', 30, 0, lo=25, hi=25), Step('rsi_overbought', 70, 0, lo=75, hi=75)),
+             'RSI閾値を{old[rsi_oversold]}/{old[rsi_overbought]}から{new[rsi_oversold]}/{new[rsi_overbought]}に調整',
+             IMP_ENTRY_PRECISION, 0.5, False),
+    ),
+    'MovingAverageBreakout': (
+        # より敏感な設定
+        Rule(W_LOW_WIN, (Step('sma_short', 20, -5, lo=10), Step('sma_medium', 50, -10, gap=10)),
+             '短期SMAを{old[sma_short]}→{new[sma_short]}、中期SMAを{old[sma_medium]}→{new[sma_medium]}に調整',
+             IMP_ENTRY_SENSITIVITY, 0.7, True),
+    ),
+    'DonchianChannel': (
+        # より保守的な設定
+        Rule(W_HIGH_DD, (Step('channel_period', 55, 20, hi=100),),
+             'チャネル期間を{old[channel_period]}→{new[channel_period]}に延長してブレイクアウトの信頼性向上',
+             IMP_DD_REDUCTION, 0.6, True),
+    ),
+    'MACD': (
+        # より敏感な設定
+        Rule(W_LOW_SHARPE, (Step('macd_fast', 12, -2, lo=8), Step('macd_slow', 26, -4, gap=8)),
+             'MACD高速を{old[macd_fast]}→{new[macd_fast]}、低速を{old[macd_slow]}→{new[macd_slow]}に調整',
+             'シグナル感度向上', 0.65, True),
+    ),
+    'RSIMomentum': (
+        # エントリー閾値の調整
+        Rule(W_LOW_WIN, (Step('rsi_entry', 50, 10, hi=65),),
+             'RSIエントリー閾値を{old[rsi_entry]}→{new[rsi_entry]}に引き上げてモメンタム強化',
+             IMP_ENTRY_PRECISION, 0.6, True),
+    ),
+    'RSIExtreme': (
+        # より極端な閾値に調整
+        Rule(W_LOW_PF, (Step('rsi_oversold', 10, -3, lo=5), Step('rsi_overbought', 75, 5, hi=85)),
+             'RSI閾値を売られ過ぎ{old[rsi_oversold]}→{new[rsi_oversold]}、買われ過ぎ{old[rsi_overbought]}→{new[rsi_overbought]}に調整',
+             'エントリーの選択性向上', 0.55, True),
+    ),
+    'BollingerBands': (
+        # より保守的な設定
+        Rule(W_HIGH_DD, (Step('bb_std', 2.0, 0.3, hi=2.5),),
+             'ボリンジャーバンド標準偏差を{old[bb_std]}→{new[bb_std]}に拡張してエントリー厳格化',
+             IMP_DD_REDUCTION, 0.65, True),
+    ),
+    'Squeeze': (
+        # 出来高フィルターを強化
+        Rule(W_LOW_WIN, (Step('volume_multiplier', 1.5, 0.3, hi=2.5),),
+             '出来高倍率を{old[volume_multiplier]}→{new[volume_multiplier]}に引き上げてエントリー精度向上',
+             'エントリー品質向上', 0.6, True),
+    ),
+    'VolumeBreakout': (
+        # ブレイクアウト期間の最適化
+        Rule(W_LOW_SHARPE, (Step('breakout_period', 20, -5, lo=15),),
+             'ブレイクアウト期間を{old[breakout_period]}→{new[breakout_period]}に短縮して感度向上',
+             'シグナル反応速度向上', 0.6, True),
+    ),
+    'OBV': (
+        # OBV期間の調整
+        Rule(W_LOW_WIN, (Step('obv_period', 20, -5, lo=15),),
+             'OBV期間を{old[obv_period]}→{new[obv_period]}に短縮してトレンド感度向上',
+             'トレンド検出精度向上', 0.6, True),
+    ),
+    'TrendFollowing': (
+        # トレンドフィルターの強化
+        Rule(W_LOW_SHARPE, (Step('adx_period', 14, 3, hi=21),),
+             'ADX期間を{old[adx_period]}→{new[adx_period]}に延長してトレンド判定安定化',
+             'トレンド判定精度向上', 0.65, True),
+        # より保守的な移動平均設定
+        Rule(W_HIGH_DD, (Step('sma_short', 20, 5, hi=30), Step('sma_medium', 50, 10, hi=70)),
+             '短期SMAを{old[sma_short]}→{new[sma_short]}、中期SMAを{old[sma_medium]}→{new[sma_medium]}に延長',
+             IMP_DD_REDUCTION, 0.7, True),
+    ),
+}
+
+def _group_rules_by_flag(rules: Tuple[Rule, ...]) -> Dict[int, Tuple[Rule, ...]]:
+    """ルールを弱点フラグごとにまとめる（フラグの初出順、同一フラグ内は定義順を維持）"""
+    grouped: Dict[int, List[Rule]] = {}
+    for rule in rules:
+        grouped.setdefault(rule.flag, []).append(rule)
+    return {flag: tuple(group) for flag, group in grouped.items()}
+
+# 戦略ごとの弱点フラグ → ルールの対応表（立っているフラグのルールだけを引く）
+_FLAG_RULES = {name: _group_rules_by_flag(rules) for name, rules in _RULES.items()}
+
+# 戦略ごとに参照する弱点フラグの和（該当フラグが無ければルールを走査しない）
+_RULE_MASKS = {name: sum(table) for name, table in _FLAG_RULES.items()}
+
 class AIImprovementProposer:
     """AIによる改善提案を生成するクラス"""
     
+    __slots__ = ('similarity_threshold', 'max_improvements_per_run', '_collect_labels')
+    
     def __init__(self):
-        self.config = config.get_backtest_config()
-        self.improvement_config = self.config.get('ai_improvement', {})
-        self.similarity_threshold = self.improvement_config.get('similarity_threshold', 0.9)
-        self.max_improvements_per_run = self.improvement_config.get('max_improvements_per_run', 3)
+        # 設定はプロセス内で不変のためキャッシュ済みの値を使用（再読込は_load_improvement_cfg.cache_clear()）
+        self.similarity_threshold, self.max_improvements_per_run = _load_improvement_cfg()
+        # 強み・弱みの文字列ラベルはログ用のため、DEBUG出力が有効な場合のみ構築
+        self._collect_labels = logger.logger.isEnabledFor(logging.DEBUG)
         
     def analyze_performance_and_propose_improvements(self, 
                                                    strategy_name: str,
                                                    current_params: Dict[str, Any],
                                                    performance_metrics: Dict[str, float],
-                                                   historical_data: pd.DataFrame = None) -> List[Dict[str, Any]]:
+                                                   historical_data: 'pd.DataFrame' = None) -> List[Dict[str, Any]]:
         """パフォーマンスを分析して改善提案を生成"""
+        if logger.logger.isEnabledFor(logging.INFO):
+            logger.info(f"戦略 '{strategy_name}' の改善提案を生成中...")
         
-        logger.info(f"戦略 '{strategy_name}' の改善提案を生成中...")
+        candidates = self._collect_candidates(strategy_name, current_params, performance_metrics, historical_data)
+        return self._finalize_proposals(strategy_name, current_params, performance_metrics, candidates)
+    
+    def generate_all_proposals(self, 
+                               strategies: Dict[str, Tuple[Dict[str, Any], Dict[str, float]]],
+                               max_workers: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """複数戦略の改善提案をまとめて生成（戦略名 → (現在のパラメータ, パフォーマンス指標)、既定は順次実行）"""
+        names = list(strategies)
+        workers = min(max_workers or 1, len(names))
+        log_info = logger.logger.isEnabledFor(logging.INFO)
+        
+        # 1戦略あたりの処理は軽く、子プロセスの起動（ライブラリ読込・JITウォームアップ）の方が重いため
+        # 戦略数が十分に多い場合のみ並列実行
+        if workers > 1 and len(names) >= _PARALLEL_MIN_STRATEGIES:
+            if log_info:
+                logger.info(f"{len(names)}戦略の改善提案を生成中（{workers}プロセス）...")
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                candidates = list(pool.map(_collect_candidates_worker,
+                                           [(name, *strategies[name]) for name in names]))
+        else:
+            candidates = []
+            for name in names:
+                if log_info:
+                    logger.info(f"戦略 '{name}' の改善提案を生成中...")
+                candidates.append(self._collect_candidates(name, *strategies[name]))
         
+        # 動的最適化の状態更新と履歴との照合はグローバル状態を扱うため親プロセスで順に実行
+        return {
+            name: self._finalize_proposals(name, *strategies[name], strategy_candidates)
+            for name, strategy_candidates in zip(names, candidates)
+        }
+    
+    def _collect_candidates(self, 
+                            strategy_name: str,
+                            current_params: Dict[str, Any],
+                            performance_metrics: Dict[str, float],
+                            historical_data: 'pd.DataFrame' = None) -> List[Proposal]:
+        """パフォーマンスを分析して改善提案の候補を生成（グローバル状態を変更しない）"""
         # 現在のパフォーマンスを分析
         analysis = self._analyze_current_performance(performance_metrics)
         
-        # 改善提案を生成
+        # 改善提案を生成（類似除外後も上限を満たせるよう上限の2倍の候補が集まった時点で打ち切り）
         proposals = []
-        
-        # 1. パラメータ調整提案
-        param_proposals = self._generate_parameter_improvements(
-            strategy_name, current_params, analysis
-        )
-        proposals.extend(param_proposals)
-        
-        # 2. リスク管理改善提案
-        risk_proposals = self._generate_risk_improvements(
-            strategy_name, current_params, analysis
-        )
-        proposals.extend(risk_proposals)
-        
-        # 3. 戦略組み合わせ提案
-        combination_proposals = self._generate_combination_improvements(
-            strategy_name, current_params, analysis
-        )
-        proposals.extend(combination_proposals)
-        
+        candidate_limit = self.max_improvements_per_run * 2
+        
+        # 各生成メソッドはジェネレータのため、打ち切られた後段の提案は生成されない
+        sources = []
+        # 弱点もリスク要因も無い場合は弱点起因の提案生成を省略
+        if analysis['weakness_mask']:
+            sources += [
+                # 1. パラメータ調整提案
+                self._generate_parameter_improvements(strategy_name, current_params, analysis),
+                # 2. リスク管理改善提案
+                self._generate_risk_improvements(strategy_name, current_params, analysis),
+                # 3. 戦略組み合わせ提案
+                self._generate_combination_improvements(strategy_name, current_params, analysis),
+            ]
         # 4. 高度な改善提案
-        advanced_proposals = self._generate_advanced_improvements(
-            strategy_name, current_params, analysis, historical_data
+        sources.append(
+            self._generate_advanced_improvements(strategy_name, current_params, analysis, historical_data)
         )
-        proposals.extend(advanced_proposals)
         
-        # 5. 動的最適化提案
+        for source in sources:
+            proposals.extend(source)
+            if len(proposals) >= candidate_limit:
+                break
+        
+        return proposals
+    
+    def _finalize_proposals(self, 
+                            strategy_name: str,
+                            current_params: Dict[str, Any],
+                            performance_metrics: Dict[str, float],
+                            proposals: List[Proposal]) -> List[Dict[str, Any]]:
+        """動的最適化提案を加え、類似除外と件数制限を行って辞書形式で返す"""
+        # 5. 動的最適化提案（最適化状態の更新を伴うため常に実行）
         dynamic_proposals = self._generate_dynamic_optimization_proposals(
             strategy_name, current_params, performance_metrics
         )
@@ -73,533 +496,199 @@ class AIImprovementProposer:
         # 提案数を制限
         final_proposals = filtered_proposals[:self.max_improvements_per_run]
         
-        logger.info(f"改善提案を生成しました: {len(final_proposals)}件")
-        return final_proposals
+        if logger.logger.isEnabledFor(logging.INFO):
+            logger.info(f"改善提案を生成しました: {len(final_proposals)}件")
+        return [proposal.to_dict() for proposal in final_proposals]
     
     def _analyze_current_performance(self, metrics: Dict[str, float]) -> Dict[str, Any]:
         """現在のパフォーマンスを分析"""
+        values = np.fromiter((metrics.get(k, 0) for k in _ANALYSIS_KEYS), dtype=np.float64,
+                             count=len(_ANALYSIS_KEYS)) * _ANALYSIS_DIRECTION
+        
+        # 4指標の強み・弱み判定を一括比較し、ビットの内積でフラグに変換
+        strength_flags = int(np.dot(values > _STRENGTH_THRESHOLDS, _STRENGTH_BITS))
+        flags = int(np.dot(values < _WEAKNESS_THRESHOLDS, _WEAKNESS_BITS))
+        
         analysis = {
             'strengths': [],
             'weaknesses': [],
             'improvement_areas': [],
-            'risk_level': 'medium'
+            'risk_level': 'high' if flags & W_HIGH_RISK else 'medium',
+            'weakness_mask': flags
         }
         
-        # シャープレシオの分析
-        sharpe = metrics.get('sharpe_ratio', 0)
-        if sharpe > 1.5:
-            analysis['strengths'].append('高いシャープレシオ')
-        elif sharpe < 0.5:
-            analysis['weaknesses'].append('低いシャープレシオ')
-            analysis['improvement_areas'].append('リターン/リスク比の改善')
-        
-        # 最大ドローダウンの分析
-        max_dd = metrics.get('max_drawdown', 0)
-        if max_dd < 0.1:
-            analysis['strengths'].append('低い最大ドローダウン')
-        elif max_dd > 0.3:
-            analysis['weaknesses'].append('高い最大ドローダウン')
-            analysis['improvement_areas'].append('リスク管理の強化')
-            analysis['risk_level'] = 'high'
-        
-        # 勝率の分析
-        win_rate = metrics.get('win_rate', 0)
-        if win_rate > 0.6:
-            analysis['strengths'].append('高い勝率')
-        elif win_rate < 0.4:
-            analysis['weaknesses'].append('低い勝率')
-            analysis['improvement_areas'].append('エントリー/エグジット条件の改善')
-        
-        # 利益因子の分析
-        profit_factor = metrics.get('profit_factor', 0)
-        if profit_factor > 1.5:
-            analysis['strengths'].append('高い利益因子')
-        elif profit_factor < 1.0:
-            analysis['weaknesses'].append('低い利益因子')
-            analysis['improvement_areas'].append('損益比の改善')
+        if self._collect_labels:
+            analysis['strengths'] = [label for bit, label in _STRENGTH_LABELS if strength_flags & bit]
+            analysis['weaknesses'] = [label for bit, label, _ in _WEAKNESS_LABELS if flags & bit]
+            analysis['improvement_areas'] = [area for bit, _, area in _WEAKNESS_LABELS if flags & bit]
+            logger.debug(f"パフォーマンス分析 - 強み: {analysis['strengths']}, 弱み: {analysis['weaknesses']}")
         
         return analysis
     
+    @staticmethod
+    def _first_or(params: Dict[str, Any], key: str, default: Any) -> Any:
+        """リスト形式パラメータの先頭要素を取得（未設定・空の場合は既定値）"""
+        value = params.get(key)
+        return value[0] if value else default
+    
     def _generate_parameter_improvements(self, 
                                        strategy_name: str,
                                        current_params: Dict[str, Any],
-                                       analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+                                       analysis: Dict[str, Any]) -> Iterator[Proposal]:
         """パラメータ調整による改善提案を生成"""
-        proposals = []
-        
-        # 戦略別のパラメータ改善提案
-        strategy_improvers = {
-            'FixedSma': self._propose_sma_improvements,
-            'SmaCross': self._propose_sma_cross_improvements,
-            'Momentum': self._propose_momentum_improvements,
-            'MovingAverageBreakout': self._propose_ma_breakout_improvements,
-            'DonchianChannel': self._propose_donchian_improvements,
-            'MACD': self._propose_macd_improvements,
-            'RSIMomentum': self._propose_rsi_momentum_improvements,
-            'RSIExtreme': self._propose_rsi_extreme_improvements,
-            'BollingerBands': self._propose_bollinger_improvements,
-            'Squeeze': self._propose_squeeze_improvements,
-            'VolumeBreakout': self._propose_volume_breakout_improvements,
-            'OBV': self._propose_obv_improvements,
-            'TrendFollowing': self._propose_trend_following_improvements,
-        }
-        
-        improver_func = strategy_improvers.get(strategy_name)
-        if improver_func:
-            proposals.extend(improver_func(current_params, analysis))
+        if strategy_name in _RULES:
+            yield from self._apply_rules(strategy_name, current_params, analysis['weakness_mask'])
         else:
             logger.warning(f"戦略 '{strategy_name}' の改善提案は未実装です")
             # 汎用的な改善提案を生成
-            proposals.extend(self._propose_generic_improvements(current_params, analysis))
-        
-        return proposals
-    
-    def _propose_sma_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """SMA戦略の改善提案"""
-        proposals = []
-        
-        current_sma = current_params.get('sma_period', 20)
-        
-        # 短期SMAの提案（より敏感なエントリー）
-        if '低い勝率' in analysis['weaknesses']:
-            short_sma = max(5, current_sma - 5)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'SMA期間を{current_sma}から{short_sma}に短縮してエントリー感度を向上',
-                'new_params': {**current_params, 'sma_period': short_sma},
-                'expected_improvement': '勝率向上',
-                'confidence': 0.7
-            })
-        
-        # 長期SMAの提案（より安定したトレンド追従）
-        if '高い最大ドローダウン' in analysis['weaknesses']:
-            long_sma = min(50, current_sma + 10)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'SMA期間を{current_sma}から{long_sma}に延長してトレンド安定性を向上',
-                'new_params': {**current_params, 'sma_period': long_sma},
-                'expected_improvement': 'ドローダウン削減',
-                'confidence': 0.6
-            })
-        
-        return proposals
-    
-    def _propose_sma_cross_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """SMAクロス戦略の改善提案"""
-        proposals = []
-        
-        fast_sma = current_params.get('fast_sma', 10)
-        slow_sma = current_params.get('slow_sma', 30)
-        
-        # より敏感なクロス設定
-        if '低い勝率' in analysis['weaknesses']:
-            new_fast = max(5, fast_sma - 2)
-            new_slow = max(new_fast + 5, slow_sma - 5)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'高速SMAを{fast_sma}→{new_fast}、低速SMAを{slow_sma}→{new_slow}に調整',
-                'new_params': {**current_params, 'fast_sma': new_fast, 'slow_sma': new_slow},
-                'expected_improvement': 'エントリー感度向上',
-                'confidence': 0.7
-            })
-        
-        # より安定したクロス設定
-        if '高い最大ドローダウン' in analysis['weaknesses']:
-            new_fast = min(20, fast_sma + 5)
-            new_slow = min(50, slow_sma + 10)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'高速SMAを{fast_sma}→{new_fast}、低速SMAを{slow_sma}→{new_slow}に調整',
-                'new_params': {**current_params, 'fast_sma': new_fast, 'slow_sma': new_slow},
-                'expected_improvement': 'トレンド安定性向上',
-                'confidence': 0.6
-            })
-        
-        return proposals
+            yield from self._propose_generic_improvements(current_params, analysis['weakness_mask'])
     
-    def _propose_momentum_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """モメンタム戦略の改善提案"""
-        proposals = []
-        
-        rsi_period = current_params.get('rsi_period', 14)
-        rsi_oversold = current_params.get('rsi_oversold', 30)
-        rsi_overbought = current_params.get('rsi_overbought', 70)
-        
-        # RSI感度向上
-        if '低い勝率' in analysis['weaknesses']:
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'RSI期間を{rsi_period}から{max(7, rsi_period-3)}に短縮',
-                'new_params': {**current_params, 'rsi_period': max(7, rsi_period-3)},
-                'expected_improvement': 'RSI感度向上',
-                'confidence': 0.6
-            })
-        
-        # RSI閾値調整
-        if '低い利益因子' in analysis['weaknesses']:
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'RSI閾値を{rsi_oversold}/{rsi_overbought}から25/75に調整',
-                'new_params': {**current_params, 'rsi_oversold': 25, 'rsi_overbought': 75},
-                'expected_improvement': 'エントリー精度向上',
-                'confidence': 0.5
-            })
-        
-        return proposals
+    def _apply_rules(self, strategy_name: str, current_params: Dict[str, Any], flags: int) -> Iterator[Proposal]:
+        """戦略別の改善ルール表を解釈して提案を生成"""
+        if not flags & _RULE_MASKS[strategy_name]:
+            return
+        
+        for bit, rules in _FLAG_RULES[strategy_name].items():
+            if flags & bit:
+                for rule in rules:
+                    yield self._build_rule_proposal(current_params, rule)
     
-    def _propose_ma_breakout_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """移動平均ブレイクアウト戦略の改善提案"""
-        proposals = []
-        
-        sma_short = current_params.get('sma_short', [20, 30])[0] if current_params.get('sma_short') else 20
-        sma_medium = current_params.get('sma_medium', [50, 60])[0] if current_params.get('sma_medium') else 50
-        
-        if '低い勝率' in analysis['weaknesses']:
-            # より敏感な設定
-            new_short = max(10, sma_short - 5)
-            new_medium = max(new_short + 10, sma_medium - 10)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'短期SMAを{sma_short}→{new_short}、中期SMAを{sma_medium}→{new_medium}に調整',
-                'new_params': {**current_params, 'sma_short': [new_short], 'sma_medium': [new_medium]},
-                'expected_improvement': 'エントリー感度向上',
-                'confidence': 0.7
-            })
-        
-        return proposals
-    
-    def _propose_donchian_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """ドンチャンチャネル戦略の改善提案"""
-        proposals = []
-        
-        channel_period = current_params.get('channel_period', [55])[0] if current_params.get('channel_period') else 55
-        
-        if '高い最大ドローダウン' in analysis['weaknesses']:
-            # より保守的な設定
-            new_period = min(100, channel_period + 20)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'チャネル期間を{channel_period}→{new_period}に延長してブレイクアウトの信頼性向上',
-                'new_params': {**current_params, 'channel_period': [new_period]},
-                'expected_improvement': 'ドローダウン削減',
-                'confidence': 0.6
-            })
-        
-        return proposals
-    
-    def _propose_macd_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """MACD戦略の改善提案"""
-        proposals = []
-        
-        macd_fast = current_params.get('macd_fast', [12])[0] if current_params.get('macd_fast') else 12
-        macd_slow = current_params.get('macd_slow', [26])[0] if current_params.get('macd_slow') else 26
-        
-        if '低いシャープレシオ' in analysis['weaknesses']:
-            # より敏感な設定
-            new_fast = max(8, macd_fast - 2)
-            new_slow = max(new_fast + 8, macd_slow - 4)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'MACD高速を{macd_fast}→{new_fast}、低速を{macd_slow}→{new_slow}に調整',
-                'new_params': {**current_params, 'macd_fast': [new_fast], 'macd_slow': [new_slow]},
-                'expected_improvement': 'シグナル感度向上',
-                'confidence': 0.65
-            })
-        
-        return proposals
-    
-    def _propose_rsi_momentum_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """RSIモメンタム戦略の改善提案"""
-        proposals = []
-        
-        rsi_period = current_params.get('rsi_period', [14])[0] if current_params.get('rsi_period') else 14
-        rsi_entry = current_params.get('rsi_entry', [50])[0] if current_params.get('rsi_entry') else 50
-        
-        if '低い勝率' in analysis['weaknesses']:
-            # エントリー閾値の調整
-            new_entry = min(65, rsi_entry + 10)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'RSIエントリー閾値を{rsi_entry}→{new_entry}に引き上げてモメンタム強化',
-                'new_params': {**current_params, 'rsi_entry': [new_entry]},
-                'expected_improvement': 'エントリー精度向上',
-                'confidence': 0.6
-            })
-        
-        return proposals
-    
-    def _propose_rsi_extreme_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """RSI極端値戦略の改善提案"""
-        proposals = []
-        
-        rsi_oversold = current_params.get('rsi_oversold', [10])[0] if current_params.get('rsi_oversold') else 10
-        rsi_overbought = current_params.get('rsi_overbought', [75])[0] if current_params.get('rsi_overbought') else 75
-        
-        if '低い利益因子' in analysis['weaknesses']:
-            # より極端な閾値に調整
-            new_oversold = max(5, rsi_oversold - 3)
-            new_overbought = min(85, rsi_overbought + 5)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'RSI閾値を売られ過ぎ{rsi_oversold}→{new_oversold}、買われ過ぎ{rsi_overbought}→{new_overbought}に調整',
-                'new_params': {**current_params, 'rsi_oversold': [new_oversold], 'rsi_overbought': [new_overbought]},
-                'expected_improvement': 'エントリーの選択性向上',
-                'confidence': 0.55
-            })
-        
-        return proposals
-    
-    def _propose_bollinger_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """ボリンジャーバンド戦略の改善提案"""
-        proposals = []
-        
-        bb_period = current_params.get('bb_period', [20])[0] if current_params.get('bb_period') else 20
-        bb_std = current_params.get('bb_std', [2.0])[0] if current_params.get('bb_std') else 2.0
-        
-        if '高い最大ドローダウン' in analysis['weaknesses']:
-            # より保守的な設定
-            new_std = min(2.5, bb_std + 0.3)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'ボリンジャーバンド標準偏差を{bb_std}→{new_std}に拡張してエントリー厳格化',
-                'new_params': {**current_params, 'bb_std': [new_std]},
-                'expected_improvement': 'ドローダウン削減',
-                'confidence': 0.65
-            })
-        
-        return proposals
-    
-    def _propose_squeeze_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """スクイーズ戦略の改善提案"""
-        proposals = []
-        
-        bb_period = current_params.get('bb_period', [20])[0] if current_params.get('bb_period') else 20
-        volume_multiplier = current_params.get('volume_multiplier', [1.5])[0] if current_params.get('volume_multiplier') else 1.5
-        
-        if '低い勝率' in analysis['weaknesses']:
-            # 出来高フィルターを強化
-            new_volume_mult = min(2.5, volume_multiplier + 0.3)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'出来高倍率を{volume_multiplier}→{new_volume_mult}に引き上げてエントリー精度向上',
-                'new_params': {**current_params, 'volume_multiplier': [new_volume_mult]},
-                'expected_improvement': 'エントリー品質向上',
-                'confidence': 0.6
-            })
-        
-        return proposals
-    
-    def _propose_volume_breakout_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """出来高ブレイクアウト戦略の改善提案"""
-        proposals = []
-        
-        breakout_period = current_params.get('breakout_period', [20])[0] if current_params.get('breakout_period') else 20
-        volume_multiplier = current_params.get('volume_multiplier', [2.0])[0] if current_params.get('volume_multiplier') else 2.0
-        
-        if '低いシャープレシオ' in analysis['weaknesses']:
-            # ブレイクアウト期間の最適化
-            new_period = max(15, breakout_period - 5)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'ブレイクアウト期間を{breakout_period}→{new_period}に短縮して感度向上',
-                'new_params': {**current_params, 'breakout_period': [new_period]},
-                'expected_improvement': 'シグナル反応速度向上',
-                'confidence': 0.6
-            })
-        
-        return proposals
-    
-    def _propose_obv_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """OBV戦略の改善提案"""
-        proposals = []
-        
-        obv_period = current_params.get('obv_period', [20])[0] if current_params.get('obv_period') else 20
-        
-        if '低い勝率' in analysis['weaknesses']:
-            # OBV期間の調整
-            new_period = max(15, obv_period - 5)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'OBV期間を{obv_period}→{new_period}に短縮してトレンド感度向上',
-                'new_params': {**current_params, 'obv_period': [new_period]},
-                'expected_improvement': 'トレンド検出精度向上',
-                'confidence': 0.6
-            })
-        
-        return proposals
-    
-    def _propose_trend_following_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """トレンドフォロー戦略の改善提案"""
-        proposals = []
-        
-        sma_short = current_params.get('sma_short', [20])[0] if current_params.get('sma_short') else 20
-        sma_medium = current_params.get('sma_medium', [50])[0] if current_params.get('sma_medium') else 50
-        adx_period = current_params.get('adx_period', [14])[0] if current_params.get('adx_period') else 14
-        
-        if '低いシャープレシオ' in analysis['weaknesses']:
-            # トレンドフィルターの強化
-            new_adx_period = min(21, adx_period + 3)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'ADX期間を{adx_period}→{new_adx_period}に延長してトレンド判定安定化',
-                'new_params': {**current_params, 'adx_period': [new_adx_period]},
-                'expected_improvement': 'トレンド判定精度向上',
-                'confidence': 0.65
-            })
-        
-        if '高い最大ドローダウン' in analysis['weaknesses']:
-            # より保守的な移動平均設定
-            new_short = min(30, sma_short + 5)
-            new_medium = min(70, sma_medium + 10)
-            proposals.append({
-                'type': 'parameter_adjustment',
-                'description': f'短期SMAを{sma_short}→{new_short}、中期SMAを{sma_medium}→{new_medium}に延長',
-                'new_params': {**current_params, 'sma_short': [new_short], 'sma_medium': [new_medium]},
-                'expected_improvement': 'ドローダウン削減',
-                'confidence': 0.7
-            })
-        
-        return proposals
+    def _build_rule_proposal(self, current_params: Dict[str, Any], rule: Rule) -> Proposal:
+        """1件のルールから調整後パラメータを計算して提案を作成"""
+        old, new = {}, {}
+        prev = None
+        for step in rule.steps:
+            key = step.key
+            current = self._first_or(current_params, key, step.default) if rule.is_list else current_params.get(key, step.default)
+            value = current + step.delta
+            lo = prev + step.gap if step.gap is not None else step.lo
+            if lo is not None:
+                value = max(lo, value)
+            if step.hi is not None:
+                value = min(step.hi, value)
+            old[key] = current
+            new[key] = prev = value
+        
+        overrides = {k: [v] for k, v in new.items()} if rule.is_list else new
+        return Proposal(
+            type='parameter_adjustment',
+            description=rule.desc.format(old=old, new=new),
+            new_params=_merge(current_params, **overrides),
+            expected_improvement=rule.improvement,
+            confidence=rule.confidence
+        )
     
-    def _propose_generic_improvements(self, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _propose_generic_improvements(self, current_params: Dict[str, Any], flags: int) -> Iterator[Proposal]:
         """汎用的な改善提案"""
-        proposals = []
+        if not flags & (W_HIGH_DD | W_LOW_WIN):
+            return
         
         # 基本的なリスク管理改善
-        if '高い最大ドローダウン' in analysis['weaknesses']:
-            proposals.append({
-                'type': 'generic_improvement',
-                'description': 'ストップロス機能の強化',
-                'new_params': {**current_params, 'enhanced_stop_loss': True},
-                'expected_improvement': 'リスク管理強化',
-                'confidence': 0.5
-            })
-        
-        if '低い勝率' in analysis['weaknesses']:
-            proposals.append({
-                'type': 'generic_improvement',
-                'description': 'エントリーフィルター追加',
-                'new_params': {**current_params, 'entry_filter': True},
-                'expected_improvement': 'エントリー精度向上',
-                'confidence': 0.5
-            })
+        if flags & W_HIGH_DD:
+            yield Proposal(
+                type='generic_improvement',
+                description='ストップロス機能の強化',
+                new_params=_merge(current_params, enhanced_stop_loss=True),
+                expected_improvement='リスク管理強化',
+                confidence=0.5
+            )
         
-        return proposals
+        if flags & W_LOW_WIN:
+            yield Proposal(
+                type='generic_improvement',
+                description='エントリーフィルター追加',
+                new_params=_merge(current_params, entry_filter=True),
+                expected_improvement=IMP_ENTRY_PRECISION,
+                confidence=0.5
+            )
     
     def _generate_risk_improvements(self, 
                                   strategy_name: str,
                                   current_params: Dict[str, Any],
-                                  analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+                                  analysis: Dict[str, Any]) -> Iterator[Proposal]:
         """リスク管理の改善提案を生成"""
-        proposals = []
-        
         # ストップロス調整
-        if '高い最大ドローダウン' in analysis['weaknesses']:
+        if analysis['weakness_mask'] & W_HIGH_DD:
             current_stop_loss = current_params.get('stop_loss', 0.05)
             tighter_stop = max(0.02, current_stop_loss * 0.8)
-            proposals.append({
-                'type': 'risk_management',
-                'description': f'ストップロスを{current_stop_loss:.1%}から{tighter_stop:.1%}に厳格化',
-                'new_params': {**current_params, 'stop_loss': tighter_stop},
-                'expected_improvement': 'ドローダウン削減',
-                'confidence': 0.8
-            })
+            yield Proposal(
+                type='risk_management',
+                description=f'ストップロスを{current_stop_loss:.1%}から{tighter_stop:.1%}に厳格化',
+                new_params=_merge(current_params, stop_loss=tighter_stop),
+                expected_improvement=IMP_DD_REDUCTION,
+                confidence=0.8
+            )
         
         # ポジションサイズ調整
-        if analysis['risk_level'] == 'high':
+        if analysis['weakness_mask'] & W_HIGH_RISK:
             current_max_position = current_params.get('max_position_size', 0.1)
             smaller_position = max(0.05, current_max_position * 0.7)
-            proposals.append({
-                'type': 'risk_management',
-                'description': f'最大ポジションサイズを{current_max_position:.1%}から{smaller_position:.1%}に削減',
-                'new_params': {**current_params, 'max_position_size': smaller_position},
-                'expected_improvement': 'リスク分散',
-                'confidence': 0.9
-            })
+            yield Proposal(
+                type='risk_management',
+                description=f'最大ポジションサイズを{current_max_position:.1%}から{smaller_position:.1%}に削減',
+                new_params=_merge(current_params, max_position_size=smaller_position),
+                expected_improvement='リスク分散',
+                confidence=0.9
+            )
         
         # 利確調整
-        if '低い利益因子' in analysis['weaknesses']:
+        if analysis['weakness_mask'] & W_LOW_PF:
             current_take_profit = current_params.get('take_profit', 0.1)
             higher_take_profit = current_take_profit * 1.5
-            proposals.append({
-                'type': 'risk_management',
-                'description': f'利確を{current_take_profit:.1%}から{higher_take_profit:.1%}に引き上げ',
-                'new_params': {**current_params, 'take_profit': higher_take_profit},
-                'expected_improvement': '利益因子向上',
-                'confidence': 0.6
-            })
-        
-        return proposals
+            yield Proposal(
+                type='risk_management',
+                description=f'利確を{current_take_profit:.1%}から{higher_take_profit:.1%}に引き上げ',
+                new_params=_merge(current_params, take_profit=higher_take_profit),
+                expected_improvement='利益因子向上',
+                confidence=0.6
+            )
     
     def _generate_combination_improvements(self, 
                                          strategy_name: str,
                                          current_params: Dict[str, Any],
-                                         analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+                                         analysis: Dict[str, Any]) -> Iterator[Proposal]:
         """戦略組み合わせの改善提案を生成"""
-        proposals = []
-        
         # フィルター追加
-        if '低い勝率' in analysis['weaknesses']:
+        if analysis['weakness_mask'] & W_LOW_WIN:
             # ボラティリティフィルター追加
-            proposals.append({
-                'type': 'strategy_combination',
-                'description': 'ATRベースのボラティリティフィルターを追加',
-                'new_params': {**current_params, 'volatility_filter': True, 'atr_period': 14},
-                'expected_improvement': 'エントリー精度向上',
-                'confidence': 0.5
-            })
+            yield Proposal(
+                type='strategy_combination',
+                description='ATRベースのボラティリティフィルターを追加',
+                new_params=_merge(current_params, volatility_filter=True, atr_period=14),
+                expected_improvement=IMP_ENTRY_PRECISION,
+                confidence=0.5
+            )
         
         # トレンドフィルター追加
-        if '低いシャープレシオ' in analysis['weaknesses']:
-            proposals.append({
-                'type': 'strategy_combination',
-                'description': '長期移動平均によるトレンドフィルターを追加',
-                'new_params': {**current_params, 'trend_filter': True, 'trend_sma': 50},
-                'expected_improvement': 'トレンド追従性向上',
-                'confidence': 0.6
-            })
-        
-        return proposals
+        if analysis['weakness_mask'] & W_LOW_SHARPE:
+            yield Proposal(
+                type='strategy_combination',
+                description='長期移動平均によるトレンドフィルターを追加',
+                new_params=_merge(current_params, trend_filter=True, trend_sma=50),
+                expected_improvement='トレンド追従性向上',
+                confidence=0.6
+            )
     
     def _generate_advanced_improvements(self, 
                                       strategy_name: str,
                                       current_params: Dict[str, Any],
                                       analysis: Dict[str, Any],
-                                      historical_performance: List[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+                                      historical_performance: List[Dict[str, float]] = None) -> Iterator[Proposal]:
         """高度な改善提案を生成"""
-        proposals = []
-        
-        # 1. 機械学習ベースの最適化提案
-        ml_proposals = self._generate_ml_optimization_proposals(
-            strategy_name, current_params, analysis, historical_performance
-        )
-        proposals.extend(ml_proposals)
-        
-        # 2. 市場環境適応型提案
-        adaptive_proposals = self._generate_adaptive_proposals(
-            strategy_name, current_params, analysis
-        )
-        proposals.extend(adaptive_proposals)
-        
-        # 3. ポートフォリオ最適化提案
-        portfolio_proposals = self._generate_portfolio_optimization_proposals(
-            strategy_name, current_params, analysis
+        return chain(
+            # 1. 機械学習ベースの最適化提案
+            self._generate_ml_optimization_proposals(strategy_name, current_params, analysis, historical_performance),
+            # 2. 市場環境適応型提案
+            self._generate_adaptive_proposals(strategy_name, current_params, analysis),
+            # 3. ポートフォリオ最適化提案
+            self._generate_portfolio_optimization_proposals(strategy_name, current_params, analysis),
+            # 4. 動的リスク管理提案
+            self._generate_dynamic_risk_proposals(strategy_name, current_params, analysis),
         )
-        proposals.extend(portfolio_proposals)
-        
-        # 4. 動的リスク管理提案
-        dynamic_risk_proposals = self._generate_dynamic_risk_proposals(
-            strategy_name, current_params, analysis
-        )
-        proposals.extend(dynamic_risk_proposals)
-        
-        return proposals
     
     def _generate_ml_optimization_proposals(self, strategy_name: str, current_params: Dict[str, Any], 
-                                          analysis: Dict[str, Any], historical_performance: List[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+                                          analysis: Dict[str, Any], historical_performance: List[Dict[str, float]] = None) -> Iterator[Proposal]:
         """機械学習ベースの最適化提案"""
-        proposals = []
-        
         # パフォーマンス履歴がある場合の学習ベース提案
         if historical_performance and len(historical_performance) >= 5:
             # トレンド分析
@@ -607,223 +696,175 @@ class AIImprovementProposer:
             performance_trend = self._analyze_performance_trend(recent_performance)
             
             if performance_trend == 'declining':
-                proposals.append({
-                    'type': 'ml_optimization',
-                    'description': f'パフォーマンス低下傾向検出 - {strategy_name}の感度調整を推奨',
-                    'new_params': self._suggest_sensitivity_adjustment(current_params, 'increase'),
-                    'expected_improvement': 'パフォーマンス回復',
-                    'confidence': 0.75,
-                    'ml_based': True
-                })
+                yield Proposal(
+                    type='ml_optimization',
+                    description=f'パフォーマンス低下傾向検出 - {strategy_name}の感度調整を推奨',
+                    new_params=self._suggest_sensitivity_adjustment(current_params, 'increase'),
+                    expected_improvement='パフォーマンス回復',
+                    confidence=0.75,
+                    meta={'ml_based': True}
+                )
             elif performance_trend == 'volatile':
-                proposals.append({
-                    'type': 'ml_optimization',
-                    'description': f'高ボラティリティ検出 - {strategy_name}の安定化調整を推奨',
-                    'new_params': self._suggest_stability_adjustment(current_params),
-                    'expected_improvement': 'パフォーマンス安定化',
-                    'confidence': 0.7,
-                    'ml_based': True
-                })
+                yield Proposal(
+                    type='ml_optimization',
+                    description=f'高ボラティリティ検出 - {strategy_name}の安定化調整を推奨',
+                    new_params=self._suggest_stability_adjustment(current_params),
+                    expected_improvement=IMP_STABILITY,
+                    confidence=0.7,
+                    meta={'ml_based': True}
+                )
         
         # 相関分析ベース提案
         correlation_proposal = self._generate_correlation_based_proposal(strategy_name, current_params, analysis)
         if correlation_proposal:
-            proposals.append(correlation_proposal)
-        
-        return proposals
+            yield correlation_proposal
     
-    def _generate_adaptive_proposals(self, strategy_name: str, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_adaptive_proposals(self, strategy_name: str, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> Iterator[Proposal]:
         """市場環境適応型提案"""
-        proposals = []
-        
         # 市場状況に応じた動的調整
         market_regime = self._detect_market_regime(analysis)
         
         if market_regime == 'trending':
-            proposals.append({
-                'type': 'adaptive_optimization',
-                'description': f'トレンド市場検出 - {strategy_name}のトレンドフォロー強化',
-                'new_params': self._enhance_trend_following(current_params),
-                'expected_improvement': 'トレンド市場での収益性向上',
-                'confidence': 0.8,
-                'market_adaptive': True
-            })
+            yield Proposal(
+                type='adaptive_optimization',
+                description=f'トレンド市場検出 - {strategy_name}のトレンドフォロー強化',
+                new_params=self._enhance_trend_following(current_params),
+                expected_improvement='トレンド市場での収益性向上',
+                confidence=0.8,
+                meta={'market_adaptive': True}
+            )
         elif market_regime == 'ranging':
-            proposals.append({
-                'type': 'adaptive_optimization',
-                'description': f'レンジ市場検出 - {strategy_name}の逆張り要素強化',
-                'new_params': self._enhance_mean_reversion(current_params),
-                'expected_improvement': 'レンジ市場での収益性向上',
-                'confidence': 0.75,
-                'market_adaptive': True
-            })
+            yield Proposal(
+                type='adaptive_optimization',
+                description=f'レンジ市場検出 - {strategy_name}の逆張り要素強化',
+                new_params=self._enhance_mean_reversion(current_params),
+                expected_improvement='レンジ市場での収益性向上',
+                confidence=0.75,
+                meta={'market_adaptive': True}
+            )
         elif market_regime == 'volatile':
-            proposals.append({
-                'type': 'adaptive_optimization',
-                'description': f'高ボラティリティ市場検出 - {strategy_name}のリスク管理強化',
-                'new_params': self._enhance_volatility_protection(current_params),
-                'expected_improvement': 'ボラティリティ耐性向上',
-                'confidence': 0.85,
-                'market_adaptive': True
-            })
-        
-        return proposals
+            yield Proposal(
+                type='adaptive_optimization',
+                description=f'高ボラティリティ市場検出 - {strategy_name}のリスク管理強化',
+                new_params=self._enhance_volatility_protection(current_params),
+                expected_improvement='ボラティリティ耐性向上',
+                confidence=0.85,
+                meta={'market_adaptive': True}
+            )
     
-    def _generate_portfolio_optimization_proposals(self, strategy_name: str, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_portfolio_optimization_proposals(self, strategy_name: str, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> Iterator[Proposal]:
         """ポートフォリオ最適化提案"""
-        proposals = []
-        
         # 分散効果の向上
-        proposals.append({
-            'type': 'portfolio_optimization',
-            'description': f'{strategy_name}の分散効果最適化 - 相関の低い銘柄群への重点配分',
-            'new_params': {**current_params, 'diversification_enhancement': True},
-            'expected_improvement': 'ポートフォリオ分散効果向上',
-            'confidence': 0.6,
-            'portfolio_based': True
-        })
+        yield Proposal(
+            type='portfolio_optimization',
+            description=f'{strategy_name}の分散効果最適化 - 相関の低い銘柄群への重点配分',
+            new_params=_merge(current_params, diversification_enhancement=True),
+            expected_improvement='ポートフォリオ分散効果向上',
+            confidence=0.6,
+            meta={'portfolio_based': True}
+        )
         
         # リスクパリティ調整
-        if '高い最大ドローダウン' in analysis['weaknesses']:
-            proposals.append({
-                'type': 'portfolio_optimization',
-                'description': f'{strategy_name}のリスクパリティ調整 - 各銘柄のリスク寄与度均等化',
-                'new_params': {**current_params, 'risk_parity': True},
-                'expected_improvement': 'リスク分散の最適化',
-                'confidence': 0.7,
-                'portfolio_based': True
-            })
-        
-        return proposals
+        if analysis['weakness_mask'] & W_HIGH_DD:
+            yield Proposal(
+                type='portfolio_optimization',
+                description=f'{strategy_name}のリスクパリティ調整 - 各銘柄のリスク寄与度均等化',
+                new_params=_merge(current_params, risk_parity=True),
+                expected_improvement='リスク分散の最適化',
+                confidence=0.7,
+                meta={'portfolio_based': True}
+            )
     
-    def _generate_dynamic_risk_proposals(self, strategy_name: str, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_dynamic_risk_proposals(self, strategy_name: str, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> Iterator[Proposal]:
         """動的リスク管理提案"""
-        proposals = []
-        
         # VaRベースのポジションサイジング
-        proposals.append({
-            'type': 'dynamic_risk_management',
-            'description': f'{strategy_name}にVaRベース動的ポジションサイジング導入',
-            'new_params': {**current_params, 'var_based_sizing': True, 'var_confidence': 0.95},
-            'expected_improvement': 'リスク調整後リターン向上',
-            'confidence': 0.8,
-            'dynamic_risk': True
-        })
+        yield Proposal(
+            type='dynamic_risk_management',
+            description=f'{strategy_name}にVaRベース動的ポジションサイジング導入',
+            new_params=_merge(current_params, var_based_sizing=True, var_confidence=0.95),
+            expected_improvement='リスク調整後リターン向上',
+            confidence=0.8,
+            meta={'dynamic_risk': True}
+        )
         
         # ボラティリティターゲット調整
         if 'ボラティリティ' in analysis.get('metrics', {}):
-            proposals.append({
-                'type': 'dynamic_risk_management',
-                'description': f'{strategy_name}にボラティリティターゲット機能追加',
-                'new_params': {**current_params, 'volatility_targeting': True, 'target_volatility': 0.15},
-                'expected_improvement': 'リスク水準の安定化',
-                'confidence': 0.75,
-                'dynamic_risk': True
-            })
-        
-        return proposals
+            yield Proposal(
+                type='dynamic_risk_management',
+                description=f'{strategy_name}にボラティリティターゲット機能追加',
+                new_params=_merge(current_params, volatility_targeting=True, target_volatility=0.15),
+                expected_improvement='リスク水準の安定化',
+                confidence=0.75,
+                meta={'dynamic_risk': True}
+            )
     
     def _analyze_performance_trend(self, recent_performance: List[Dict[str, float]]) -> str:
         """パフォーマンストレンドを分析"""
-        if len(recent_performance) < 2:
-            return 'insufficient_data'
-        
-        sharpe_values = [p.get('sharpe_ratio', 0) for p in recent_performance]
-        
-        # トレンド分析
-        if len(sharpe_values) >= 3:
-            trend = np.polyfit(range(len(sharpe_values)), sharpe_values, 1)[0]
-            volatility = np.std(sharpe_values)
-            
-            if trend < -0.1:
-                return 'declining'
-            elif volatility > 0.5:
-                return 'volatile'
-            elif trend > 0.1:
-                return 'improving'
-        
-        return 'stable'
+        return _classify_trend(tuple(p.get(SHARPE_RATIO, 0) for p in recent_performance))
     
     def _detect_market_regime(self, analysis: Dict[str, Any]) -> str:
         """市場状況を検出"""
-        # 簡単な市場状況判定（実際にはより複雑な分析が必要）
-        max_dd = analysis.get('metrics', {}).get('max_drawdown', 0)
-        sharpe = analysis.get('metrics', {}).get('sharpe_ratio', 0)
-        
-        if max_dd > 0.2:
-            return 'volatile'
-        elif sharpe > 1.0:
-            return 'trending'
-        else:
-            return 'ranging'
+        metrics = analysis.get('metrics', {})
+        return _classify_market_regime(metrics.get(MAX_DRAWDOWN, 0), metrics.get(SHARPE_RATIO, 0))
     
-    def _suggest_sensitivity_adjustment(self, current_params: Dict[str, Any], direction: str) -> Dict[str, Any]:
+    def _suggest_sensitivity_adjustment(self, current_params: Dict[str, Any], direction: str) -> Mapping[str, Any]:
         """感度調整の提案"""
-        new_params = current_params.copy()
+        overrides = {}
+        period_keys, sma_keys = _classify_param_keys(tuple(current_params))
         
-        # パラメータの感度を調整
-        for key, value in current_params.items():
+        # パラメータの感度を調整（期間系・SMA系のキーのみ走査）
+        for key in period_keys | sma_keys:
+            value = current_params[key]
             if isinstance(value, list) and len(value) > 0:
-                if 'period' in key.lower() or 'sma' in key.lower():
-                    if direction == 'increase':
-                        # より敏感に（期間を短く）
-                        new_params[key] = [max(5, int(v * 0.8)) for v in value]
-                    else:
-                        # より保守的に（期間を長く）
-                        new_params[key] = [min(100, int(v * 1.2)) for v in value]
+                if direction == 'increase':
+                    # より敏感に（期間を短く）
+                    overrides[key] = [max(5, int(v * 0.8)) for v in value]
+                else:
+                    # より保守的に（期間を長く）
+                    overrides[key] = [min(100, int(v * 1.2)) for v in value]
         
-        return new_params
+        return ChainMap(overrides, current_params)
     
-    def _suggest_stability_adjustment(self, current_params: Dict[str, Any]) -> Dict[str, Any]:
+    def _suggest_stability_adjustment(self, current_params: Dict[str, Any]) -> Mapping[str, Any]:
         """安定化調整の提案"""
-        new_params = current_params.copy()
+        overrides = {}
+        period_keys, _ = _classify_param_keys(tuple(current_params))
         
-        # より安定したパラメータに調整
-        for key, value in current_params.items():
+        # より安定したパラメータに調整（期間系のキーのみ走査）
+        for key in period_keys:
+            value = current_params[key]
             if isinstance(value, list) and len(value) > 0:
-                if 'period' in key.lower():
-                    # 期間を長くして安定化
-                    new_params[key] = [min(50, int(v * 1.3)) for v in value]
+                # 期間を長くして安定化
+                overrides[key] = [min(50, int(v * 1.3)) for v in value]
         
-        return new_params
+        return ChainMap(overrides, current_params)
     
-    def _enhance_trend_following(self, current_params: Dict[str, Any]) -> Dict[str, Any]:
+    def _enhance_trend_following(self, current_params: Dict[str, Any]) -> Mapping[str, Any]:
         """トレンドフォロー強化"""
-        new_params = current_params.copy()
-        new_params['trend_enhancement'] = True
-        new_params['trend_filter_strength'] = 1.2
-        return new_params
+        return _merge(current_params, trend_enhancement=True, trend_filter_strength=1.2)
     
-    def _enhance_mean_reversion(self, current_params: Dict[str, Any]) -> Dict[str, Any]:
+    def _enhance_mean_reversion(self, current_params: Dict[str, Any]) -> Mapping[str, Any]:
         """逆張り要素強化"""
-        new_params = current_params.copy()
-        new_params['mean_reversion_enhancement'] = True
-        new_params['reversion_strength'] = 1.1
-        return new_params
+        return _merge(current_params, mean_reversion_enhancement=True, reversion_strength=1.1)
     
-    def _enhance_volatility_protection(self, current_params: Dict[str, Any]) -> Dict[str, Any]:
+    def _enhance_volatility_protection(self, current_params: Dict[str, Any]) -> Mapping[str, Any]:
         """ボラティリティ保護強化"""
-        new_params = current_params.copy()
-        new_params['volatility_protection'] = True
-        new_params['volatility_threshold'] = 0.8
-        return new_params
+        return _merge(current_params, volatility_protection=True, volatility_threshold=0.8)
     
-    def _generate_correlation_based_proposal(self, strategy_name: str, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def _generate_correlation_based_proposal(self, strategy_name: str, current_params: Dict[str, Any], analysis: Dict[str, Any]) -> Optional[Proposal]:
         """相関分析ベース提案"""
         # 簡単な相関ベース提案（実際にはより複雑な分析が必要）
-        return {
-            'type': 'correlation_optimization',
-            'description': f'{strategy_name}の銘柄間相関を考慮した最適化',
-            'new_params': {**current_params, 'correlation_adjustment': True},
-            'expected_improvement': '分散効果向上',
-            'confidence': 0.6,
-            'correlation_based': True
-        }
+        return Proposal(
+            type='correlation_optimization',
+            description=f'{strategy_name}の銘柄間相関を考慮した最適化',
+            new_params=_merge(current_params, correlation_adjustment=True),
+            expected_improvement='分散効果向上',
+            confidence=0.6,
+            meta={'correlation_based': True}
+        )
     
-    def _generate_dynamic_optimization_proposals(self, strategy_name: str, current_params: Dict[str, Any], performance_metrics: Dict[str, float]) -> List[Dict[str, Any]]:
-        """動的最適化ベースの提案を生成"""
-        proposals = []
-        
+    def _generate_dynamic_optimization_proposals(self, strategy_name: str, current_params: Dict[str, Any], performance_metrics: Dict[str, float]) -> Iterator[Proposal]:
+        """動的最適化ベースの提案を生成（最適化状態の更新は最初の取り出し時に行われる）"""
         # 動的最適化システムから最適化されたパラメータを取得
         try:
             # パフォーマンスを動的最適化システムに更新
@@ -832,56 +873,52 @@ class AIImprovementProposer:
             # 最適化されたパラメータを取得
             optimized_params = dynamic_optimizer.optimize_parameters(strategy_name)
             
+            # 最適化状況を取得（最適化後の状態を1回だけ取得して以降で共有）
+            strategy_status = dynamic_optimizer.get_strategy_status(strategy_name) or {}
+            convergence_status = strategy_status.get('convergence_status', 'unknown')
+            
             if optimized_params and optimized_params != current_params:
-                # 最適化状況を取得
-                optimization_status = dynamic_optimizer.get_optimization_status()
-                strategy_status = optimization_status.get('strategies', {}).get(strategy_name, {})
-                
-                proposals.append({
-                    'type': 'dynamic_optimization',
-                    'description': f'{strategy_name}の動的最適化による自動調整 (収束状態: {strategy_status.get("convergence_status", "unknown")})',
-                    'new_params': optimized_params,
-                    'expected_improvement': '継続的パフォーマンス最適化',
-                    'confidence': 0.9,
-                    'dynamic_optimized': True,
-                    'convergence_status': strategy_status.get('convergence_status', 'unknown'),
-                    'adaptation_rate': strategy_status.get('adaptation_rate', 0.1)
-                })
+                yield Proposal(
+                    type='dynamic_optimization',
+                    description=f'{strategy_name}の動的最適化による自動調整 (収束状態: {convergence_status})',
+                    new_params=optimized_params,
+                    expected_improvement='継続的パフォーマンス最適化',
+                    confidence=0.9,
+                    meta={
+                        'dynamic_optimized': True,
+                        'convergence_status': convergence_status,
+                        'adaptation_rate': strategy_status.get('adaptation_rate', 0.1)
+                    }
+                )
             
             # 収束状態に基づく追加提案
-            strategy_status = optimization_status.get('strategies', {}).get(strategy_name, {})
-            convergence_status = strategy_status.get('convergence_status', 'unknown')
-            
             if convergence_status == 'diverging':
-                proposals.append({
-                    'type': 'dynamic_stabilization',
-                    'description': f'{strategy_name}の発散検出 - 安定化モードに切り替え',
-                    'new_params': {**current_params, 'optimization_mode': 'conservative'},
-                    'expected_improvement': 'パフォーマンス安定化',
-                    'confidence': 0.8,
-                    'stabilization': True
-                })
+                yield Proposal(
+                    type='dynamic_stabilization',
+                    description=f'{strategy_name}の発散検出 - 安定化モードに切り替え',
+                    new_params=_merge(current_params, optimization_mode='conservative'),
+                    expected_improvement=IMP_STABILITY,
+                    confidence=0.8,
+                    meta={'stabilization': True}
+                )
             elif convergence_status == 'converging':
-                proposals.append({
-                    'type': 'dynamic_acceleration',
-                    'description': f'{strategy_name}の収束検出 - 探索モードに切り替え',
-                    'new_params': {**current_params, 'optimization_mode': 'aggressive'},
-                    'expected_improvement': '新しい最適解の探索',
-                    'confidence': 0.7,
-                    'acceleration': True
-                })
+                yield Proposal(
+                    type='dynamic_acceleration',
+                    description=f'{strategy_name}の収束検出 - 探索モードに切り替え',
+                    new_params=_merge(current_params, optimization_mode='aggressive'),
+                    expected_improvement='新しい最適解の探索',
+                    confidence=0.7,
+                    meta={'acceleration': True}
+                )
             
         except Exception as e:
             logger.warning(f"動的最適化提案の生成エラー: {e}")
-        
-        return proposals
     
     def update_dynamic_optimization(self, strategy_name: str, params: Dict[str, Any], metrics: Dict[str, float]):
         """動的最適化システムにパフォーマンスデータを送信"""
         try:
             # 戦略の最適化を初期化（まだの場合）
-            optimization_status = dynamic_optimizer.get_optimization_status()
-            if strategy_name not in optimization_status.get('strategies', {}):
+            if not dynamic_optimizer.has_strategy(strategy_name):
                 dynamic_optimizer.initialize_strategy_optimization(strategy_name, params)
             
             # パフォーマンスデータを更新
@@ -904,9 +941,7 @@ class AIImprovementProposer:
         
         try:
             # 動的最適化の状況
-            optimization_status = dynamic_optimizer.get_optimization_status()
-            if strategy_name in optimization_status.get('strategies', {}):
-                insights['dynamic_optimization'] = optimization_status['strategies'][strategy_name]
+            insights['dynamic_optimization'] = dynamic_optimizer.get_strategy_status(strategy_name) or {}
             
             # パフォーマンストレンド
             performance_stats = improvement_history.get_performance_statistics(strategy_name)
@@ -942,22 +977,44 @@ class AIImprovementProposer:
         
         return insights
     
-    def _filter_similar_proposals(self, strategy_name: str, proposals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _filter_similar_proposals(self, strategy_name: str, proposals: List[Proposal]) -> List[Proposal]:
         """類似提案をフィルタリング"""
-        filtered_proposals = []
+        log_info = logger.logger.isEnabledFor(logging.INFO)
         
+        # 同一パラメータの提案はハッシュで先に除外（最初の提案を残す）
+        seen = set()
+        unique_proposals = []
         for proposal in proposals:
-            new_params = proposal['new_params']
-            
-            # 類似履歴をチェック
-            similar_records = improvement_history.check_similar_improvements(
-                strategy_name, new_params, self.similarity_threshold
-            )
-            
+            fingerprint = _params_fingerprint(proposal.new_params)
+            if fingerprint in seen:
+                if log_info:
+                    logger.info(f"重複提案を除外: {proposal.description}")
+                continue
+            seen.add(fingerprint)
+            unique_proposals.append(proposal)
+        
+        # 履歴と完全に一致する提案は類似度計算の前にハッシュで除外
+        identical = improvement_history.find_identical_improvements(
+            strategy_name, [proposal.new_params for proposal in unique_proposals]
+        )
+        candidates = []
+        for proposal, is_identical in zip(unique_proposals, identical):
+            if not is_identical:
+                candidates.append(proposal)
+            elif log_info:
+                logger.info(f"類似提案を除外: {proposal.description} (履歴と同一)")
+        
+        # 残った提案の類似履歴を1回でまとめてチェック
+        similar_per_proposal = improvement_history.check_similar_improvements_batch(
+            strategy_name, [proposal.new_params for proposal in candidates], self.similarity_threshold
+        )
+        
+        filtered_proposals = []
+        for proposal, similar_records in zip(candidates, similar_per_proposal):
             if not similar_records:
                 filtered_proposals.append(proposal)
-            else:
-                logger.info(f"類似提案を除外: {proposal['description']} (類似履歴: {len(similar_records)}件)")
+            elif log_info:
+                logger.info(f"類似提案を除外: {proposal.description} (類似履歴: {len(similar_records)}件)")
         
         return filtered_proposals
     
@@ -969,122 +1026,53 @@ class AIImprovementProposer:
                                     new_metrics: Dict[str, float]) -> Dict[str, Any]:
         """改善提案の評価結果を生成"""
         
-        # 改善スコアを計算
-        improvement_score = self._calculate_improvement_score(old_metrics, new_metrics)
+        # 改善スコア・詳細な比較・リスクを1回の計算でまとめて求める
+        n_compare = len(old_metrics)
+        keys, weights, sign, dd_index = _metric_layout(tuple(old_metrics))
+        score, risk, status = _evaluate_kernel(
+            _dict_to_vec(old_metrics, keys), _dict_to_vec(new_metrics, keys), weights, sign, n_compare, dd_index
+        )
+        improvement_score = float(score)
+        status = status.tolist()
+        compare_keys = keys[:n_compare]
         
         # 改善度合いを判定
         improvement_level = self._determine_improvement_level(improvement_score)
         
-        # 詳細な比較分析
-        comparison = self._compare_metrics(old_metrics, new_metrics)
+        comparison = {
+            'improved_metrics': [k for k, st in zip(compare_keys, status) if st == 1],
+            'degraded_metrics': [k for k, st in zip(compare_keys, status) if st == -1],
+            'unchanged_metrics': [k for k, st in zip(compare_keys, status) if st == 0]
+        }
         
         evaluation = {
             'improvement_score': improvement_score,
             'improvement_level': improvement_level,
             'comparison': comparison,
             'recommendation': self._generate_recommendation(improvement_score, comparison),
-            'risk_assessment': self._assess_improvement_risk(old_metrics, new_metrics)
+            'risk_assessment': _RISK_LEVELS[risk]
         }
         
         return evaluation
     
-    def _calculate_improvement_score(self, old_metrics: Dict[str, float], new_metrics: Dict[str, float]) -> float:
-        """改善スコアを計算"""
-        weights = {
-            'sharpe_ratio': 0.25,
-            'sortino_ratio': 0.20,
-            'calmar_ratio': 0.15,
-            'max_drawdown': 0.15,
-            'win_rate': 0.10,
-            'profit_factor': 0.10,
-            'total_return': 0.05
-        }
-        
-        score = 0.0
-        for metric, weight in weights.items():
-            old_val = old_metrics.get(metric, 0)
-            new_val = new_metrics.get(metric, 0)
-            
-            if metric == 'max_drawdown':
-                # ドローダウンは小さい方が良い
-                improvement = (old_val - new_val) / max(abs(old_val), 0.01)
-            else:
-                # その他は大きい方が良い
-                improvement = (new_val - old_val) / max(abs(old_val), 0.01)
-            
-            score += weight * improvement
-        
-        return score
-    
     def _determine_improvement_level(self, score: float) -> str:
         """改善レベルを判定"""
-        if score > 0.2:
-            return 'significant'
-        elif score > 0.1:
-            return 'moderate'
-        elif score > 0.05:
-            return 'minor'
-        elif score > -0.05:
-            return 'neutral'
-        else:
-            return 'degradation'
-    
-    def _compare_metrics(self, old_metrics: Dict[str, float], new_metrics: Dict[str, float]) -> Dict[str, Any]:
-        """メトリクスの詳細比較"""
-        comparison = {
-            'improved_metrics': [],
-            'degraded_metrics': [],
-            'unchanged_metrics': []
-        }
-        
-        for metric in old_metrics.keys():
-            old_val = old_metrics.get(metric, 0)
-            new_val = new_metrics.get(metric, 0)
-            
-            if metric == 'max_drawdown':
-                # ドローダウンは小さい方が良い
-                if new_val < old_val * 0.95:
-                    comparison['improved_metrics'].append(metric)
-                elif new_val > old_val * 1.05:
-                    comparison['degraded_metrics'].append(metric)
-                else:
-                    comparison['unchanged_metrics'].append(metric)
-            else:
-                # その他は大きい方が良い
-                if new_val > old_val * 1.05:
-                    comparison['improved_metrics'].append(metric)
-                elif new_val < old_val * 0.95:
-                    comparison['degraded_metrics'].append(metric)
-                else:
-                    comparison['unchanged_metrics'].append(metric)
-        
-        return comparison
+        # 各区切りを「より大きい」で判定するためbisect_leftを使用
+        return _IMPROVEMENT_LEVELS[bisect_left(_SCORE_BREAKS, score)]
     
     def _generate_recommendation(self, score: float, comparison: Dict[str, Any]) -> str:
         """推奨事項を生成"""
-        if score > 0.2:
-            return "強く推奨 - 大幅な改善が期待されます"
-        elif score > 0.1:
-            return "推奨 - 中程度の改善が期待されます"
-        elif score > 0.05:
-            return "軽微な改善 - 小さな改善が期待されます"
-        elif score > -0.05:
-            return "中立 - 大きな変化は期待されません"
-        else:
-            return "非推奨 - パフォーマンスの悪化が懸念されます"
-    
-    def _assess_improvement_risk(self, old_metrics: Dict[str, float], new_metrics: Dict[str, float]) -> str:
-        """改善のリスクを評価"""
-        # ドローダウンの悪化をチェック
-        old_dd = old_metrics.get('max_drawdown', 0)
-        new_dd = new_metrics.get('max_drawdown', 0)
-        
-        if new_dd > old_dd * 1.2:
-            return 'high'
-        elif new_dd > old_dd * 1.1:
-            return 'medium'
-        else:
-            return 'low'
+        return _RECOMMENDATIONS[bisect_left(_SCORE_BREAKS, score)]
+
+def _collect_candidates_worker(args: Tuple[str, Dict[str, Any], Dict[str, float]]) -> List[Proposal]:
+    """プロセスプール用: 1戦略分の改善提案候補を生成"""
+    return AIImprovementProposer()._collect_candidates(*args)
+
+# グローバルインスタンス（初回アクセス時に生成）
+def __getattr__(name: str) -> Any:
+    if name == 'ai_improver':
+        global ai_improver
+        ai_improver = AIImprovementProposer()
+        return ai_improver
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# グローバルインスタンス
-ai_improver = AIImprovementProposer()
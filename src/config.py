@@ -4,75 +4,164 @@
 """
 
 import os
+import re
+import copy
+import hashlib
 import yaml
-from typing import Dict, Any, Optional, List
+from functools import lru_cache
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import logging
 
+# libyamlのCバインディングが利用可能な場合は高速なローダーを使用
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# 環境変数参照（${VAR} / ${VAR:-default}）のパターン（グループ1: 変数名, グループ2: デフォルト値）
+_ENV_RE = re.compile(r'\$\{([^}:]+)(?::-([^}]*))?\}')
+
+# 設定ファイルの内容と参照している環境変数名（キー: (パス, 更新時刻)）
+_SOURCE_CACHE: Dict[Tuple[str, int], Tuple[str, Tuple[str, ...]]] = {}
+# 環境変数展開・YAML解析済みの設定（キー: (パス, 更新時刻, 参照環境変数のハッシュ)）
+_CONFIG_CACHE: Dict[Tuple[str, int, str], Dict[str, Any]] = {}
+
+# 検証結果（キー: _CONFIG_CACHEと同じ）
+_VALIDATION_CACHE: Dict[Tuple[str, int, str], Tuple[str, ...]] = {}
+
+# 設定スキーマ: 必須セクションと期待する型
+_REQUIRED_SECTIONS = {
+    'backtest': dict,
+    'strategies': dict,
+    'universe': dict,
+}
+
+def _validate_schema(config_data: Any) -> Tuple[str, ...]:
+    """設定内容をスキーマに照らして検証し、エラーメッセージを返す"""
+    if not isinstance(config_data, dict):
+        return ("設定ファイルの形式が不正です",)
+    
+    errors = []
+    
+    # 必須設定のチェック
+    for section, expected_type in _REQUIRED_SECTIONS.items():
+        if section not in config_data:
+            errors.append(f"必須セクション '{section}' が見つかりません")
+        elif not isinstance(config_data[section], expected_type):
+            errors.append(f"セクション '{section}' の形式が不正です")
+    
+    # バックテスト設定の検証
+    backtest = config_data.get('backtest')
+    if not isinstance(backtest, dict) or not backtest.get('start_date'):
+        errors.append("start_date が設定されていません")
+    
+    # 戦略設定の検証
+    strategies = config_data.get('strategies')
+    if not strategies:
+        errors.append("有効な戦略が設定されていません")
+    elif isinstance(strategies, dict):
+        errors.extend(f"戦略 '{name}' の設定形式が不正です"
+                      for name, strategy in strategies.items() if not isinstance(strategy, dict))
+    
+    return tuple(errors)
+
+def _env_digest(var_names: Tuple[str, ...]) -> str:
+    """参照している環境変数の現在値からハッシュを作成"""
+    h = hashlib.blake2b(digest_size=16)
+    for name in var_names:
+        value = os.environ.get(name)
+        h.update(name.encode('utf-8'))
+        h.update(b'\0' if value is None else b'=' + value.encode('utf-8'))
+        h.update(b'\n')
+    return h.hexdigest()
+
+@lru_cache(maxsize=4)
+def _parse_config_file(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """設定ファイルを解析（パス・更新時刻・サイズが同じ間は解析結果を再利用）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+def load_config_snapshot(config_path: Path) -> Dict[str, Any]:
+    """設定ファイルの内容を環境変数を展開せずに、変更可能なコピーとして取得（書き戻し用）"""
+    stat = config_path.stat()
+    return copy.deepcopy(_parse_config_file(str(config_path.resolve()), stat.st_mtime_ns, stat.st_size))
+
 class ConfigManager:
     """設定ファイルと環境変数を管理するクラス"""
     
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = Path(config_path)
         self.config = {}
+        self._flat: Dict[str, Any] = {}
+        self._enabled_strategies: Optional[Tuple[str, ...]] = None
+        self._cache_key: Optional[Tuple[str, int, str]] = None
         self.load_config()
         
     def load_config(self):
         """設定ファイルを読み込み、環境変数を展開"""
         if not self.config_path.exists():
             raise FileNotFoundError(f"設定ファイルが見つかりません: {self.config_path}")
+        
+        # ファイルと参照環境変数が変わっていなければ解析済みの設定を再利用
+        source_key = (str(self.config_path.resolve()), self.config_path.stat().st_mtime_ns)
+        source = _SOURCE_CACHE.get(source_key)
+        if source is None:
+            with open(self.config_path, 'r', encoding='utf-8') as f:
+                config_content = f.read()
+            var_names = tuple(dict.fromkeys(m.group(1) for m in _ENV_RE.finditer(config_content)))
+            source = _SOURCE_CACHE[source_key] = (config_content, var_names)
+        config_content, var_names = source
+        
+        cache_key = self._cache_key = (*source_key, _env_digest(var_names))
+        cached = _CONFIG_CACHE.get(cache_key)
+        if cached is None:
+            # 環境変数を展開（参照が無い場合は置換処理を省略）
+            if var_names:
+                config_content = self._expand_environment_variables(config_content)
             
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            config_content = f.read()
-            
-        # 環境変数を展開
-        config_content = self._expand_environment_variables(config_content)
+            # YAMLとして解析
+            cached = _CONFIG_CACHE[cache_key] = yaml.load(config_content, Loader=_YamlLoader)
         
-        # YAMLとして解析
-        self.config = yaml.safe_load(config_content)
+        # 呼び出し側での変更がキャッシュに波及しないようコピーを保持
+        self.config = copy.deepcopy(cached)
+        
+        # ドット記法のキー索引を作り直し、有効戦略のキャッシュを破棄
+        self._flat = {}
+        self._build_flat_index(self.config, '')
+        self._enabled_strategies = None
+    
+    def _build_flat_index(self, node: Any, prefix: str):
+        """ネストした設定を走査し、ドット区切りのキー → 値（途中の辞書も含む）の索引を作成"""
+        if not isinstance(node, dict):
+            return
+        for k, value in node.items():
+            if not isinstance(k, str):
+                continue
+            key = prefix + k
+            self._flat[key] = value
+            self._build_flat_index(value, key + '.')
         
     def _expand_environment_variables(self, content: str) -> str:
         """文字列内の環境変数を展開"""
+        environ = os.environ
+        
         def replace_var(match):
-            var_name = match.group(1)
-            default_value = match.group(0)
-            env_value = os.getenv(var_name)
-            
+            var_name, default = match.groups()
+            env_value = environ.get(var_name, default)
             if env_value is None:
-                # デフォルト値がある場合（${VAR:-default}形式）
-                if ':-' in var_name:
-                    var_name, default = var_name.split(':-', 1)
-                    env_value = os.getenv(var_name, default)
-                else:
-                    return default_value
+                # デフォルト値が無い未設定の変数はそのまま残す
+                return match.group(0)
             
-            # 数値型の環境変数を適切に変換
-            if env_value.lower() in ['true', 'false']:
-                return env_value.lower()
-            elif env_value.lower() == 'null':
-                return 'null'
-            elif env_value.startswith('[') and env_value.endswith(']'):
-                # リスト形式の場合はそのまま返す（YAMLが自動解析）
-                return env_value
-            else:
-                # 数値の場合はそのまま返す（YAMLが自動変換）
-                return env_value
+            # 真偽値・nullは小文字に揃える（数値・リスト形式はYAMLが自動解析）
+            lowered = env_value.lower()
+            return lowered if lowered in ('true', 'false', 'null') else env_value
             
-        import re
-        return re.sub(r'\$\{([^}]+)\}', replace_var, content)
+        return _ENV_RE.sub(replace_var, content)
         
     def get(self, key: str, default: Any = None) -> Any:
         """設定値を取得（ドット記法対応）"""
-        keys = key.split('.')
-        value = self.config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-                
-        return value
+        return self._flat.get(key, default)
         
     def get_backtest_config(self) -> Dict[str, Any]:
         """バックテスト設定を取得"""
@@ -104,9 +193,11 @@ class ConfigManager:
         
     def get_enabled_strategies(self) -> List[str]:
         """有効な戦略のリストを取得"""
-        strategies = self.get_strategies_config()
-        return [name for name, config in strategies.items() 
-                if config.get('enabled', False)]
+        if self._enabled_strategies is None:
+            strategies = self.get_strategies_config()
+            self._enabled_strategies = tuple(name for name, config in strategies.items() 
+                                             if config.get('enabled', False))
+        return list(self._enabled_strategies)
                 
     def get_strategy_params(self, strategy_name: str) -> Dict[str, Any]:
         """指定戦略のパラメータを取得"""
@@ -123,26 +214,11 @@ class ConfigManager:
         return strategies[strategy_name].get('risk_management', {})
         
     def validate_config(self) -> List[str]:
-        """設定の妥当性を検証"""
-        errors = []
-        
-        # 必須設定のチェック
-        required_sections = ['backtest', 'strategies', 'universe']
-        for section in required_sections:
-            if section not in self.config:
-                errors.append(f"必須セクション '{section}' が見つかりません")
-                
-        # バックテスト設定の検証
-        backtest = self.get_backtest_config()
-        if not backtest.get('start_date'):
-            errors.append("start_date が設定されていません")
-            
-        # 戦略設定の検証
-        strategies = self.get_strategies_config()
-        if not strategies:
-            errors.append("有効な戦略が設定されていません")
-            
-        return errors
+        """設定の妥当性を検証（同じ設定内容の検証結果は再利用）"""
+        errors = _VALIDATION_CACHE.get(self._cache_key)
+        if errors is None:
+            errors = _VALIDATION_CACHE[self._cache_key] = _validate_schema(self.config)
+        return list(errors)
 
 # グローバル設定インスタンス
 config = ConfigManager()
@@ -7,8 +7,12 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional, Tuple, Any
+import json
 import time
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import pickle
 from datetime import datetime, timedelta
@@ -18,8 +22,35 @@ warnings.filterwarnings('ignore')
 from src.config import config
 from src.logger import get_logger
 
+# pyarrowが利用可能な場合はFeather形式でキャッシュ（pickleより高速に読み込める）
+try:
+    from pyarrow import feather as pa_feather
+    FEATHER_AVAILABLE = True
+except ImportError:
+    pa_feather = None
+    FEATHER_AVAILABLE = False
+
+_CACHE_SUFFIX = '.feather' if FEATHER_AVAILABLE else '.pkl'
+
 logger = get_logger("data_manager")
 
+class TokenBucket:
+    """一定間隔でリクエストを許可するレート制限（前回からの経過時間を差し引いた分だけ待機）"""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.next_time = time.monotonic()
+        self._lock = threading.Lock()
+        
+    def acquire(self):
+        """次のリクエスト枠まで待機（枠の予約はスレッド間で排他し、待機はロック外で行う）"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
 class DataManager:
     """データ取得と管理を行うクラス"""
     
@@ -29,16 +60,17 @@ class DataManager:
         self.cache_dir = Path("cache")
         self.cache_dir.mkdir(exist_ok=True)
         
+        # プロセス内のメモリキャッシュ（キャッシュキー -> (保存時刻, データ)、LRUで上限管理）
+        self._memory_cache: 'OrderedDict[str, Tuple[float, pd.DataFrame]]' = OrderedDict()
+        self._memory_cache_size = self.data_config.get('memory_cache_size', 256)
+        self._memory_cache_lock = threading.Lock()
+        
+        # Yahoo Financeへのリクエスト間隔の制御（全スレッドで共有）
+        self._rate_limiter = TokenBucket(self.data_config.get('rate_limit_delay', 1))
+        
     def get_ohlcv_data(self, ticker: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """OHLCVデータを取得（キャッシュ対応）"""
-        if start_date is None:
-            start_date = self.backtest_config.get('start_date', '2005-01-01')
-        if end_date is None:
-            end_date = self.backtest_config.get('end_date')
-        
-        # end_dateの処理（'null'文字列をNoneに変換）
-        if end_date == 'null' or end_date == 'None':
-            end_date = None
+        start_date, end_date = self._resolve_dates(start_date, end_date)
             
         # キャッシュチェック
         cached_data = self._load_from_cache(ticker, start_date, end_date)
@@ -46,6 +78,11 @@ class DataManager:
             logger.debug(f"キャッシュからデータ読み込み: {ticker}")
             return cached_data
             
+        # 取得済み期間の続きだけを取得して追加
+        extended_data = self._extend_cached_data(ticker, start_date, end_date)
+        if extended_data is not None:
+            return extended_data
+            
         # データ取得
         data = self._fetch_data_with_retry(ticker, start_date, end_date)
         
@@ -58,11 +95,22 @@ class DataManager:
             
         return data if data is not None else pd.DataFrame()
         
+    def _resolve_dates(self, start_date: Optional[str], end_date: Optional[str]) -> Tuple[str, Optional[str]]:
+        """取得期間の既定値を補完"""
+        if start_date is None:
+            start_date = self.backtest_config.get('start_date', '2005-01-01')
+        if end_date is None:
+            end_date = self.backtest_config.get('end_date')
+        
+        # end_dateの処理（'null'文字列をNoneに変換）
+        if end_date == 'null' or end_date == 'None':
+            end_date = None
+        return start_date, end_date
+        
     def _fetch_data_with_retry(self, ticker: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
         """リトライ機能付きデータ取得"""
         max_attempts = self.data_config.get('retry_attempts', 3)
         retry_delay = self.data_config.get('retry_delay', 60)
-        rate_limit_delay = self.data_config.get('rate_limit_delay', 1)
         
         # end_dateの処理（'null'文字列をNoneに変換）
         if end_date == 'null' or end_date == 'None':
@@ -73,7 +121,7 @@ class DataManager:
                 logger.debug(f"データ取得試行 {attempt + 1}/{max_attempts}: {ticker}")
                 
                 # レート制限対応
-                time.sleep(rate_limit_delay)
+                self._rate_limiter.acquire()
                 
                 df = yf.download(
                     ticker,
@@ -133,8 +181,8 @@ class DataManager:
         if 'Volume' not in df.columns:
             df['Volume'] = 0
             
-        # 列の順序を統一
-        df = df[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
+        # 列の順序を統一（列の選択で新しいフレームになるため追加のコピーは不要）
+        df = df.reindex(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
         
         # インデックスをDatetimeに変換
         if not isinstance(df.index, pd.DatetimeIndex):
@@ -179,15 +227,21 @@ class DataManager:
         
     def _remove_outliers(self, df: pd.DataFrame) -> pd.DataFrame:
         """異常値の除去"""
-        # 価格の異常値検出（前日比±50%以上）
-        price_cols = ['Open', 'High', 'Low', 'Close']
-        for col in price_cols:
-            if col in df.columns:
-                returns = df[col].pct_change().abs()
-                outliers = returns > 0.5
-                if outliers.any():
-                    df.loc[outliers, col] = np.nan
-                    
+        # 価格の異常値検出（前日比±50%以上）を全価格列まとめて1回で判定
+        price_cols = [col for col in ['Open', 'High', 'Low', 'Close'] if col in df.columns]
+        if not price_cols:
+            return df
+            
+        prices = df[price_cols].to_numpy(dtype=np.float64)
+        if len(prices) > 1:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = np.abs(prices[1:] / prices[:-1] - 1.0)
+            outliers = np.zeros(prices.shape, dtype=bool)
+            outliers[1:] = returns > 0.5
+            if outliers.any():
+                prices[outliers] = np.nan
+                df[price_cols] = prices
+                
         # 欠損値を前日値で補完
         df[price_cols] = df[price_cols].ffill()
         
@@ -195,120 +249,427 @@ class DataManager:
         
     def _validate_prices(self, df: pd.DataFrame) -> pd.DataFrame:
         """価格の妥当性チェック"""
-        # High >= Low のチェック
-        if 'High' in df.columns and 'Low' in df.columns:
-            invalid_high_low = df['High'] < df['Low']
-            if invalid_high_low.any():
-                df.loc[invalid_high_low, 'High'] = df.loc[invalid_high_low, 'Low']
-                
-        # Open, Close が High, Low の範囲内かチェック
-        if all(col in df.columns for col in ['Open', 'High', 'Low', 'Close']):
-            invalid_open = (df['Open'] > df['High']) | (df['Open'] < df['Low'])
-            invalid_close = (df['Close'] > df['High']) | (df['Close'] < df['Low'])
-            
-            if invalid_open.any():
-                df.loc[invalid_open, 'Open'] = df.loc[invalid_open, 'Close']
-            if invalid_close.any():
-                df.loc[invalid_close, 'Close'] = df.loc[invalid_close, 'Open']
+        if 'High' not in df.columns or 'Low' not in df.columns:
+            return df
+            
+        # High >= Low を保証
+        low = df['Low'].to_numpy()
+        high = np.maximum(df['High'].to_numpy(), low)
+        df['High'] = high
+        
+        # Open, Close を High, Low の範囲内に収める
+        for col in ('Open', 'Close'):
+            if col in df.columns:
+                df[col] = np.clip(df[col].to_numpy(), low, high)
                 
         return df
         
     def _validate_volume(self, df: pd.DataFrame) -> pd.DataFrame:
         """出来高の妥当性チェック"""
         if 'Volume' in df.columns:
+            volume = df['Volume'].to_numpy(dtype=np.float64, copy=True)
+            
             # 負の出来高を0に
-            df.loc[df['Volume'] < 0, 'Volume'] = 0
+            np.maximum(volume, 0, out=volume)
             
             # 極端に大きな出来高を制限
-            volume_99th = df['Volume'].quantile(0.99)
+            volume_99th = np.nanquantile(volume, 0.99) if len(volume) else 0
             if volume_99th > 0:
-                df.loc[df['Volume'] > volume_99th * 10, 'Volume'] = volume_99th * 10
+                np.minimum(volume, volume_99th * 10, out=volume)
+                
+            df['Volume'] = volume.astype(df['Volume'].dtype, copy=False)
                 
         return df
         
     def _get_cache_key(self, ticker: str, start_date: str, end_date: str) -> str:
-        """キャッシュキーの生成"""
+        """キャッシュキーの生成（メモリキャッシュ用）"""
         # end_dateの処理（'null'文字列をNoneに変換）
         if end_date == 'null' or end_date == 'None':
             end_date = 'None'
-        return f"{ticker}_{start_date}_{end_date}.pkl"
+        return f"{ticker}_{start_date}_{end_date}"
         
-    def _get_cache_path(self, ticker: str, start_date: str, end_date: str) -> Path:
-        """キャッシュファイルパスの取得"""
-        cache_key = self._get_cache_key(ticker, start_date, end_date)
-        return self.cache_dir / cache_key
+    def _get_cache_path(self, ticker: str) -> Path:
+        """キャッシュファイルパスの取得（銘柄ごとに1ファイル、期間はメタデータファイルで管理）"""
+        return self.cache_dir / f"{ticker}{_CACHE_SUFFIX}"
         
-    def _load_from_cache(self, ticker: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
-        """キャッシュからデータを読み込み"""
-        cache_path = self._get_cache_path(ticker, start_date, end_date)
+    def _get_summary_path(self, ticker: str) -> Path:
+        """サマリーファイルパスの取得（キャッシュ保存時に作成）"""
+        return self.cache_dir / f"{ticker}.summary.json"
+        
+    def _get_meta_path(self, ticker: str) -> Path:
+        """取得済み期間のメタデータファイルパスの取得（{start, end, fetched_at, full_fetched_at}）"""
+        return self.cache_dir / f"{ticker}.meta.json"
         
-        if not cache_path.exists():
+    def _load_cache_entry(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """銘柄の取得済み期間を読み込み（複数プロセスで共有するため毎回ファイルから読む）"""
+        try:
+            with open(self._get_meta_path(ticker), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"キャッシュメタデータ読み込み失敗: {ticker} - {e}")
             return None
             
-        # キャッシュの有効期限チェック
+    def _drop_cache_entry(self, ticker: str):
+        """銘柄の取得済み期間を削除"""
+        self._get_meta_path(ticker).unlink(missing_ok=True)
+        
+    def _tmp_path(self, path: Path) -> Path:
+        """書き込み用の一時ファイルパス（プロセス・スレッドごとに別名にして書き込みの衝突を防ぐ）"""
+        return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        
+    def _write_json_atomic(self, path: Path, data: Dict[str, Any]):
+        """JSONファイルを一時ファイルから置き換えて書き込み"""
+        tmp_path = self._tmp_path(path)
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, default=float)
+            os.replace(tmp_path, path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+            
+
+    def _can_extend(self, entry: Optional[Dict[str, Any]], start_date: str) -> bool:
+        """キャッシュ済みデータを要求期間の先頭から利用できるかを判定"""
+        if entry is None:
+            return False
+        # 配当・分割による過去の調整後価格を反映するため、一定期間ごとに全期間を取り直す
+        full_refresh_interval = self.data_config.get('full_refresh_interval', 604800)  # 7日
+        if time.time() - entry['full_fetched_at'] > full_refresh_interval:
+            return False
+        return pd.Timestamp(start_date) >= pd.Timestamp(entry['start'])
+        
+    def _is_range_cached(self, entry: Optional[Dict[str, Any]], start_date: str, end_date: str) -> bool:
+        """キャッシュ済みの期間が要求期間を含むかを判定"""
+        if not self._can_extend(entry, start_date):
+            return False
+        if entry['end'] is not None:
+            return end_date is not None and pd.Timestamp(end_date) <= pd.Timestamp(entry['end'])
+            
+        # 終了日なしで取得したデータは取得時点までを含む
+        if end_date is None:
+            cache_duration = self.data_config.get('cache_duration', 86400)  # 24時間
+            return time.time() - entry['fetched_at'] <= cache_duration
+        fetched_date = datetime.fromtimestamp(entry['fetched_at']).strftime('%Y-%m-%d')
+        return pd.Timestamp(end_date) <= pd.Timestamp(fetched_date)
+        
+    def _slice_range(self, df: pd.DataFrame, start_date: str, end_date: str) -> pd.DataFrame:
+        """要求期間の行を切り出し（終了日はyfinanceと同じく含まない）"""
+        mask = df.index >= pd.Timestamp(start_date)
+        if end_date is not None:
+            mask &= df.index < pd.Timestamp(end_date)
+        return df if mask.all() else df[mask]
+        
+    def _load_from_cache(self, ticker: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        """キャッシュからデータを読み込み（メモリキャッシュ → ファイルキャッシュの順に参照）"""
+        cache_key = self._get_cache_key(ticker, start_date, end_date)
         cache_duration = self.data_config.get('cache_duration', 86400)  # 24時間
-        cache_age = time.time() - cache_path.stat().st_mtime
         
-        if cache_age > cache_duration:
-            logger.debug(f"キャッシュ期限切れ: {ticker}")
-            cache_path.unlink()
+        cached = self._get_from_memory_cache(cache_key, cache_duration)
+        if cached is not None:
+            return cached
+            
+        entry = self._load_cache_entry(ticker)
+        if not self._is_range_cached(entry, start_date, end_date):
             return None
             
-        try:
-            with open(cache_path, 'rb') as f:
-                data = pickle.load(f)
-            return data
-        except Exception as e:
-            logger.warning(f"キャッシュ読み込み失敗: {ticker} - {e}")
-            cache_path.unlink()
+        data = self._read_ticker_cache(ticker)
+        if data is None:
             return None
             
-    def _save_to_cache(self, ticker: str, start_date: str, end_date: str, data: pd.DataFrame):
-        """データをキャッシュに保存"""
-        cache_path = self._get_cache_path(ticker, start_date, end_date)
+        data = self._slice_range(data, start_date, end_date)
+        self._put_to_memory_cache(cache_key, entry['fetched_at'], data)
+        return data.copy(deep=False)
+        
+    def _read_ticker_cache(self, ticker: str) -> Optional[pd.DataFrame]:
+        """銘柄のキャッシュファイルを読み込み（読み込めない場合は取得済み期間も削除）"""
+        cache_path = self._get_cache_path(ticker)
+        
+        # 存在確認のstatは行わず、直接開いて存在しなければ次の候補へ
+        candidates = [cache_path]
+        if cache_path.suffix != '.pkl':
+            # 旧形式（pickle）のキャッシュがあればそれを読み込む
+            candidates.append(cache_path.with_suffix('.pkl'))
+            
+        for path in candidates:
+            try:
+                return self._read_cache_file(path)
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                logger.warning(f"キャッシュ読み込み失敗: {ticker} - {e}")
+                path.unlink(missing_ok=True)
+                break
+                
+        self._drop_cache_entry(ticker)
+        return None
+        
+    def _extend_cached_data(self, ticker: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        """キャッシュ済みデータの最終日以降だけを取得して追加（利用できない場合はNone）"""
+        entry = self._load_cache_entry(ticker)
+        if not self._can_extend(entry, start_date):
+            return None
+            
+        cached = self._read_ticker_cache(ticker)
+        if cached is None or cached.empty:
+            return None
+            
+        tail_start = (cached.index.max() + timedelta(days=1)).strftime('%Y-%m-%d')
+        if end_date is not None and pd.Timestamp(tail_start) >= pd.Timestamp(end_date):
+            return self._slice_range(cached, start_date, end_date)
+            
+        tail = self._fetch_data_with_retry(ticker, tail_start, end_date)
+        if tail is None or tail.empty:
+            # 休場日などで新しい行が無い場合はキャッシュ済みの範囲で応答
+            return self._slice_range(cached, start_date, end_date)
+            
+        combined = pd.concat([cached, tail])
+        combined = combined[~combined.index.duplicated(keep='last')]
+        combined = self._validate_and_clean_data(combined, ticker)
+        if combined.empty:
+            return None
+            
+        self._save_to_cache(ticker, entry['start'], end_date, combined, full_fetched_at=entry['full_fetched_at'])
+        logger.debug(f"キャッシュ差分更新: {ticker} - {len(tail)}件追加")
+        return self._slice_range(combined, start_date, end_date)
+        
+    def _save_to_cache(self, ticker: str, start_date: str, end_date: str, data: pd.DataFrame,
+                       full_fetched_at: Optional[float] = None):
+        """データをキャッシュに保存（full_fetched_atは差分追加時に元の全期間取得時刻を引き継ぐ）"""
+        now = time.time()
+        self._put_to_memory_cache(self._get_cache_key(ticker, start_date, end_date), now, data)
         
         try:
-            with open(cache_path, 'wb') as f:
-                pickle.dump(data, f)
+            self._write_cache_file(self._get_cache_path(ticker), data)
+            
+            # サマリーを別ファイルに保存し、get_data_summaryで全データを読み込まずに済ませる
+            if not data.empty:
+                self._write_json_atomic(self._get_summary_path(ticker), {
+                    'start': start_date,
+                    'end': end_date,
+                    'fetched_at': now,
+                    'summary': self._build_summary(ticker, data)
+                })
+                
+            # 取得済み期間はデータの書き込み後に銘柄ごとのファイルへ保存（他プロセスの銘柄を上書きしない）
+            self._write_json_atomic(self._get_meta_path(ticker), {
+                'start': start_date,
+                'end': end_date,
+                'fetched_at': now,
+                'full_fetched_at': full_fetched_at or now
+            })
             logger.debug(f"キャッシュ保存: {ticker}")
         except Exception as e:
             logger.warning(f"キャッシュ保存失敗: {ticker} - {e}")
             
+    def _get_from_memory_cache(self, cache_key: str, cache_duration: float) -> Optional[pd.DataFrame]:
+        """メモリキャッシュから取得（期限切れは破棄）"""
+        with self._memory_cache_lock:
+            entry = self._memory_cache.get(cache_key)
+            if entry is None:
+                return None
+            saved_at, data = entry
+            if time.time() - saved_at > cache_duration:
+                del self._memory_cache[cache_key]
+                return None
+            self._memory_cache.move_to_end(cache_key)
+        # 呼び出し側の列の追加・置換がキャッシュに波及しないよう浅いコピーを返す
+        return data.copy(deep=False)
+        
+    def _put_to_memory_cache(self, cache_key: str, saved_at: float, data: pd.DataFrame):
+        """メモリキャッシュに登録（上限を超えた分は古いものから破棄）"""
+        if self._memory_cache_size <= 0:
+            return
+        with self._memory_cache_lock:
+            self._memory_cache[cache_key] = (saved_at, data.copy(deep=False))
+            self._memory_cache.move_to_end(cache_key)
+            while len(self._memory_cache) > self._memory_cache_size:
+                self._memory_cache.popitem(last=False)
+                
+    def _read_cache_file(self, cache_path: Path) -> pd.DataFrame:
+        """キャッシュファイルを形式に応じて読み込み"""
+        if cache_path.suffix == '.feather':
+            # 列ごとに別ブロックのまま変換し、DataFrame構築時の結合コピーを省く（下流で書き換えるため配列は書き込み可能なコピー）
+            table = pa_feather.read_table(cache_path)
+            return table.to_pandas(split_blocks=True).set_index('Date')
+        return pd.read_pickle(cache_path, compression=None)
+            
+    def _write_cache_file(self, cache_path: Path, data: pd.DataFrame):
+        """キャッシュファイルを形式に応じて書き込み（一時ファイルから置き換え、書き込み途中のファイルを読ませない）"""
+        tmp_path = self._tmp_path(cache_path)
+        try:
+            if cache_path.suffix == '.feather':
+                # 非圧縮のFeatherは読み込み時にデコードが不要
+                data.rename_axis('Date').reset_index().to_feather(tmp_path, compression='uncompressed')
+            else:
+                # プロトコル5はnumpy配列をPickleBufferとして余分なコピーなしで書き出す（キャッシュ用途のため非圧縮）
+                data.to_pickle(tmp_path, compression=None, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+            
     def get_multiple_tickers(self, tickers: List[str], start_date: str = None, end_date: str = None) -> Dict[str, pd.DataFrame]:
-        """複数銘柄のデータを一括取得"""
-        results = {}
+        """複数銘柄のデータを一括取得（キャッシュ未命中の銘柄は1回のダウンロードにまとめる）"""
+        start_date, end_date = self._resolve_dates(start_date, end_date)
         
+        loaded = {}
+        misses = []
         for ticker in tickers:
-            try:
-                data = self.get_ohlcv_data(ticker, start_date, end_date)
-                if not data.empty:
-                    results[ticker] = data
-                else:
-                    logger.warning(f"データ取得失敗: {ticker}")
-            except Exception as e:
-                logger.error(f"データ取得エラー: {ticker} - {e}")
+            cached_data = self._load_from_cache(ticker, start_date, end_date)
+            if cached_data is not None:
+                logger.debug(f"キャッシュからデータ読み込み: {ticker}")
+                loaded[ticker] = cached_data
+            else:
+                misses.append(ticker)
+                
+        if misses:
+            # 取得済み期間を延長できる銘柄は差分取得に回し、それ以外を一括取得
+            new_tickers = [t for t in misses if not self._can_extend(self._load_cache_entry(t), start_date)]
+            fetched = self._fetch_batch_data(new_tickers, start_date, end_date) if new_tickers else {}
+            
+            # 一括取得できた銘柄の検証・保存はスレッドで並行実行
+            # （yf.downloadはモジュール共有の状態を使うため、通信は並行させない）
+            if fetched:
+                max_workers = max(1, min(self.data_config.get('parallel_workers', 8), len(fetched)))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(self._complete_ticker_data, ticker, data, start_date, end_date): ticker
+                        for ticker, data in fetched.items()
+                    }
+                    for future in as_completed(futures):
+                        ticker = futures[future]
+                        try:
+                            loaded[ticker] = future.result()
+                        except Exception as e:
+                            logger.error(f"データ取得エラー: {ticker} - {e}")
+                            
+            # 差分取得する銘柄と一括取得で欠けた銘柄は単一銘柄の経路で順番に取得
+            for ticker in misses:
+                if ticker in fetched:
+                    continue
+                try:
+                    loaded[ticker] = self.get_ohlcv_data(ticker, start_date, end_date)
+                except Exception as e:
+                    logger.error(f"データ取得エラー: {ticker} - {e}")
+                    
+        results = {}
+        for ticker in tickers:
+            data = loaded.get(ticker)
+            if data is None:
+                continue
+            if not data.empty:
+                results[ticker] = data
+            else:
+                logger.warning(f"データ取得失敗: {ticker}")
                 
         return results
         
+    def _complete_ticker_data(self, ticker: str, data: pd.DataFrame,
+                              start_date: str, end_date: str) -> pd.DataFrame:
+        """一括取得した銘柄データを検証・保存"""
+        data = self._validate_and_clean_data(data, ticker)
+        if not data.empty:
+            self._save_to_cache(ticker, start_date, end_date, data)
+        return data
+        
+    def _fetch_batch_data(self, tickers: List[str], start_date: str, end_date: str) -> Dict[str, pd.DataFrame]:
+        """複数銘柄を1回のyf.downloadで取得し、銘柄ごとに分割"""
+        try:
+            logger.debug(f"一括データ取得: {len(tickers)}銘柄")
+            
+            # レート制限対応（一括取得1回で1リクエスト分）
+            self._rate_limiter.acquire()
+            
+            df = yf.download(
+                tickers,
+                start=start_date,
+                end=end_date,
+                auto_adjust=True,
+                progress=False,
+                threads=True,
+                group_by='ticker'
+            )
+        except Exception as e:
+            logger.warning(f"一括データ取得失敗: {e} - 銘柄ごとに再試行します")
+            return {}
+            
+        if df is None or df.empty:
+            return {}
+            
+        if not isinstance(df.columns, pd.MultiIndex):
+            # 単一銘柄の場合は単層の列で返ることがある
+            frames = {tickers[0]: df} if len(tickers) == 1 else {}
+        else:
+            frames = {ticker: df[ticker] for ticker in df.columns.get_level_values(0).unique()}
+            
+        results = {}
+        for ticker, frame in frames.items():
+            # 取得できなかった銘柄は全行が欠損値になる
+            frame = self._normalize_ohlcv_columns(frame.dropna(how='all'))
+            if frame.empty:
+                logger.log_data_fetch(ticker, False, 0, "データが空")
+                continue
+            logger.log_data_fetch(ticker, True, len(frame))
+            results[ticker] = frame
+            
+        return results
+        
     def clear_cache(self, older_than_days: int = 7):
         """古いキャッシュを削除"""
         cutoff_time = time.time() - (older_than_days * 24 * 60 * 60)
         deleted_count = 0
         
-        for cache_file in self.cache_dir.glob("*.pkl"):
+        with self._memory_cache_lock:
+            for cache_key in [k for k, (saved_at, _) in self._memory_cache.items() if saved_at < cutoff_time]:
+                del self._memory_cache[cache_key]
+        
+        cache_files = list(self.cache_dir.glob("*.pkl")) + list(self.cache_dir.glob("*.feather"))
+        for cache_file in cache_files:
             if cache_file.stat().st_mtime < cutoff_time:
                 cache_file.unlink()
+                self._get_summary_path(cache_file.stem).unlink(missing_ok=True)
+                self._drop_cache_entry(cache_file.stem)
                 deleted_count += 1
                 
         logger.info(f"キャッシュクリア完了: {deleted_count}ファイル削除")
         
     def get_data_summary(self, ticker: str, start_date: str = None, end_date: str = None) -> Dict[str, Any]:
-        """データのサマリー情報を取得"""
+        """データのサマリー情報を取得（キャッシュ保存時のサマリーがあれば全データを読み込まない）"""
+        start_date, end_date = self._resolve_dates(start_date, end_date)
+        
+        summary = self._load_cached_summary(ticker, start_date, end_date)
+        if summary is not None:
+            return summary
+            
         data = self.get_ohlcv_data(ticker, start_date, end_date)
         
         if data.empty:
             return {"ticker": ticker, "status": "no_data"}
             
+        return self._build_summary(ticker, data)
+        
+    def _load_cached_summary(self, ticker: str, start_date: str, end_date: Optional[str]) -> Optional[Dict[str, Any]]:
+        """キャッシュ済みデータと同じ期間のサマリーを読み込み（該当しない場合はNone）"""
+        entry = self._load_cache_entry(ticker)
+        if entry is None or (entry['start'], entry['end']) != (start_date, end_date):
+            return None
+        if not self._is_range_cached(entry, start_date, end_date):
+            return None
+            
+        try:
+            with open(self._get_summary_path(ticker), 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+            
+        # キャッシュファイルと同時に保存されたサマリーのみ使用
+        if cached.get('fetched_at') != entry['fetched_at']:
+            return None
+        return cached['summary']
+        
+    def _build_summary(self, ticker: str, data: pd.DataFrame) -> Dict[str, Any]:
+        """データのサマリー情報を作成"""
         summary = {
             "ticker": ticker,
             "status": "success",
@@ -3,30 +3,109 @@
 リアルタイムでのパラメータ調整と適応的最適化を提供
 """
 
-import json
+import atexit
+import os
+from collections import deque
+from itertools import islice
 import numpy as np
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Deque, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field, fields
 import pandas as pd
 
 from src.config import config
 from src.logger import get_logger
+from src.jsonio import json_dumps, json_loads
 from src.improvement_history import improvement_history
+from src.jit import njit
 
 logger = get_logger("dynamic_optimizer")
 
+def _recent(history: Deque[Dict[str, float]], n: int) -> List[Dict[str, float]]:
+    """履歴の末尾n件を取得（dequeはスライスできないためisliceで取り出す）"""
+    return list(islice(history, max(len(history) - n, 0), None))
+
+def _restore_nan(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """保存時にnullとして書き出された指標値（orjsonはNaNをnullにする）をNaNに戻す"""
+    return {k: float('nan') if v is None else v for k, v in entry.items()}
+
+def _numeric_param_vector(params: Dict[str, Any]) -> Tuple[List[str], np.ndarray, List[bool]]:
+    """リスト形式の数値パラメータの先頭値を1本のベクトルに展開（名前、値、整数か否か）"""
+    names, values, is_int = [], [], []
+    for param_name, param_value in params.items():
+        if isinstance(param_value, list) and len(param_value) > 0:
+            current_val = param_value[0]
+            if isinstance(current_val, (int, float)):
+                names.append(param_name)
+                values.append(current_val)
+                is_int.append(isinstance(current_val, int))
+    return names, np.array(values, dtype=np.float64), is_int
+
+def _unpack_params(params: Dict[str, Any], names: List[str], values: np.ndarray,
+                   is_int: List[bool], mask: Optional[np.ndarray] = None) -> Dict[str, Any]:
+    """更新後のベクトルをパラメータ辞書に書き戻す（maskがFalseの要素は元の値のまま）"""
+    new_params = params.copy()
+    for i, (param_name, new_val) in enumerate(zip(names, values.tolist())):
+        if mask is None or mask[i]:
+            new_params[param_name] = [int(new_val) if is_int[i] else new_val]
+    return new_params
+
+@njit(cache=True)
+def _gradient_step(values: np.ndarray, gradient: float, adaptation_rate: float) -> np.ndarray:
+    """勾配に基づく更新（[1, 現在値の2倍] に制限）"""
+    out = np.empty_like(values)
+    for i in range(values.shape[0]):
+        current_val = values[i]
+        step_size = adaptation_rate * abs(current_val) * 0.1
+        out[i] = max(1.0, min(current_val + gradient * step_size, current_val * 2.0))
+    return out
+
+@njit(cache=True)
+def _bounded_step(values: np.ndarray, deltas: np.ndarray, upper_factor: float) -> np.ndarray:
+    """変化量を加えて [1, 現在値のupper_factor倍] に制限"""
+    out = np.empty_like(values)
+    for i in range(values.shape[0]):
+        current_val = values[i]
+        out[i] = max(1.0, min(current_val + deltas[i], current_val * upper_factor))
+    return out
+
 @dataclass
 class OptimizationState:
     """最適化状態を表すデータクラス"""
     strategy_name: str
     current_params: Dict[str, Any]
-    performance_history: List[Dict[str, float]]
+    performance_history: Deque[Dict[str, float]]  # 最大長はperformance_window
     optimization_mode: str  # "conservative", "aggressive", "adaptive"
     last_update: str
     convergence_status: str  # "converging", "diverging", "stable"
     adaptation_rate: float
+    # performance_historyと同じ並びのシャープレシオ（記録が無い位置はNaN、保存対象外）
+    sharpe_window: np.ndarray = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.rebuild_sharpe_window()
+    
+    def rebuild_sharpe_window(self):
+        """パフォーマンス履歴からシャープレシオの配列を再構築"""
+        size = self.performance_history.maxlen or len(self.performance_history)
+        self.sharpe_window = np.full(size, np.nan)
+        values = [h.get('sharpe_ratio', np.nan) for h in self.performance_history]
+        if values:
+            self.sharpe_window[size - len(values):] = values
+    
+    def append_performance(self, entry: Dict[str, float]):
+        """パフォーマンス記録を追加（シャープレシオの配列も同時に1つずらして更新）"""
+        self.performance_history.append(entry)
+        window = self.sharpe_window
+        if len(window):
+            window[:-1] = window[1:]
+            window[-1] = entry.get('sharpe_ratio', np.nan)
+    
+    def recent_sharpe(self, n: int) -> np.ndarray:
+        """直近n件のうちシャープレシオが記録されている値"""
+        recent = self.sharpe_window[-n:]
+        return recent[~np.isnan(recent)]
 
 class DynamicParameterOptimizer:
     """動的パラメータ最適化クラス"""
@@ -46,18 +125,28 @@ class DynamicParameterOptimizer:
         self.convergence_threshold = self.optimization_config.get('convergence_threshold', 0.02)
         self.min_samples_for_optimization = self.optimization_config.get('min_samples', 10)
         
+        # 未保存の更新がある戦略（更新のたびに全体を書き直さず、まとめて保存する）
+        self._dirty: set = set()
+        self._pending_updates = 0
+        self._flush_every = self.optimization_config.get('flush_every', 50)
+        
+        # 乱数生成器（各最適化手法で必要な乱数を1回の呼び出しでまとめて生成する）
+        self._rng = np.random.default_rng()
+        
         self.load_optimization_states()
+        atexit.register(self.flush)
     
     def load_optimization_states(self):
         """最適化状態を読み込み"""
         if self.state_file.exists():
             try:
-                with open(self.state_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.optimization_states = {
-                        name: OptimizationState(**state_data)
-                        for name, state_data in data.items()
-                    }
+                data = json_loads(self.state_file.read_bytes())
+                self.optimization_states = {}
+                for name, state_data in data.items():
+                    state_data['performance_history'] = self._new_history(
+                        _restore_nan(entry) for entry in state_data.get('performance_history', ())
+                    )
+                    self.optimization_states[name] = OptimizationState(**state_data)
                 logger.info(f"最適化状態を読み込み: {len(self.optimization_states)}戦略")
             except Exception as e:
                 logger.error(f"最適化状態の読み込みエラー: {e}")
@@ -69,21 +158,47 @@ class DynamicParameterOptimizer:
         """最適化状態を保存"""
         try:
             data = {
-                name: asdict(state)
+                name: self._state_to_dict(state)
                 for name, state in self.optimization_states.items()
             }
-            with open(self.state_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            # 一時ファイルに書き出してから置き換え、書き込み途中のファイルを残さない
+            tmp_file = self.state_file.with_suffix('.tmp')
+            tmp_file.write_bytes(json_dumps(data))
+            os.replace(tmp_file, self.state_file)
+            self._dirty.clear()
+            self._pending_updates = 0
             logger.info("最適化状態を保存")
         except Exception as e:
             logger.error(f"最適化状態の保存エラー: {e}")
     
+    def _new_history(self, entries=()) -> Deque[Dict[str, float]]:
+        """パフォーマンス履歴を作成（追加時に古い記録は自動的に破棄される）"""
+        return deque(entries, maxlen=self.performance_window)
+    
+    def _state_to_dict(self, state: OptimizationState) -> Dict[str, Any]:
+        """最適化状態を保存用の辞書に変換"""
+        data = {f.name: getattr(state, f.name) for f in fields(state) if f.init}
+        data['performance_history'] = list(state.performance_history)
+        return data
+    
+    def flush(self):
+        """未保存の更新があれば最適化状態を保存"""
+        if self._dirty:
+            self.save_optimization_states()
+    
+    def _mark_dirty(self, strategy_name: str):
+        """更新を記録し、一定回数ごとにまとめて保存"""
+        self._dirty.add(strategy_name)
+        self._pending_updates += 1
+        if self._pending_updates >= self._flush_every:
+            self.flush()
+    
     def initialize_strategy_optimization(self, strategy_name: str, initial_params: Dict[str, Any]):
         """戦略の最適化を初期化"""
         state = OptimizationState(
             strategy_name=strategy_name,
             current_params=initial_params,
-            performance_history=[],
+            performance_history=self._new_history(),
             optimization_mode="adaptive",
             last_update=datetime.now().isoformat(),
             convergence_status="stable",
@@ -107,10 +222,8 @@ class DynamicParameterOptimizer:
             'timestamp': datetime.now().isoformat(),
             **metrics
         }
-        state.performance_history.append(performance_entry)
-        
-        # 履歴を制限
-        state.performance_history = state.performance_history[-self.performance_window:]
+        # 履歴はperformance_window件に制限される
+        state.append_performance(performance_entry)
         
         # 収束状態を更新
         state.convergence_status = self._analyze_convergence(state)
@@ -120,7 +233,7 @@ class DynamicParameterOptimizer:
         
         state.last_update = datetime.now().isoformat()
         
-        self.save_optimization_states()
+        self._mark_dirty(strategy_name)
         logger.info(f"パフォーマンス更新: {strategy_name}, 収束状態: {state.convergence_status}")
     
     def optimize_parameters(self, strategy_name: str) -> Optional[Dict[str, Any]]:
@@ -154,7 +267,7 @@ class DynamicParameterOptimizer:
             state.current_params = new_params
             state.last_update = datetime.now().isoformat()
             
-            self.save_optimization_states()
+            self._mark_dirty(strategy_name)
             
             logger.info(f"パラメータ最適化完了: {strategy_name}")
             logger.info(f"旧パラメータ: {old_params}")
@@ -170,11 +283,7 @@ class DynamicParameterOptimizer:
             return "insufficient_data"
         
         # 最近のシャープレシオの変動を分析
-        recent_sharpe = [
-            h.get('sharpe_ratio', 0) 
-            for h in state.performance_history[-10:]
-            if 'sharpe_ratio' in h
-        ]
+        recent_sharpe = state.recent_sharpe(10)
         
         if len(recent_sharpe) < 3:
             return "insufficient_data"
@@ -225,106 +334,74 @@ class DynamicParameterOptimizer:
     
     def _gradient_based_optimization(self, state: OptimizationState) -> Dict[str, Any]:
         """勾配ベース最適化"""
-        current_params = state.current_params.copy()
-        new_params = current_params.copy()
-        
-        # 最近のパフォーマンスから勾配を推定
-        recent_performance = state.performance_history[-5:]
-        target_metric = 'sharpe_ratio'
-        
-        # パラメータごとに勾配を推定して調整
-        for param_name, param_value in current_params.items():
-            if isinstance(param_value, list) and len(param_value) > 0:
-                # リストパラメータの場合、最初の値を調整
-                current_val = param_value[0]
-                if isinstance(current_val, (int, float)):
-                    # 簡単な数値微分による勾配推定
-                    gradient = self._estimate_gradient(state, param_name, target_metric)
-                    
-                    # 勾配に基づく更新
-                    step_size = state.adaptation_rate * abs(current_val) * 0.1
-                    new_val = current_val + gradient * step_size
-                    
-                    # 範囲制限
-                    new_val = max(1, min(new_val, current_val * 2))
-                    new_params[param_name] = [int(new_val) if isinstance(current_val, int) else new_val]
-        
-        return new_params
+        current_params = state.current_params
+        names, values, is_int = _numeric_param_vector(current_params)
+        if not names:
+            return current_params.copy()
+        
+        # 簡単な数値微分による勾配推定（簡易推定はパラメータによらないため1回だけ計算）
+        gradient = self._estimate_gradient(state, names[0], 'sharpe_ratio')
+        
+        # リストパラメータの最初の値をまとめて更新
+        new_values = _gradient_step(values, gradient, state.adaptation_rate)
+        return _unpack_params(current_params, names, new_values, is_int)
     
     def _bayesian_optimization(self, state: OptimizationState) -> Dict[str, Any]:
         """ベイジアン最適化（簡易版）"""
-        current_params = state.current_params.copy()
-        new_params = current_params.copy()
+        current_params = state.current_params
+        names, values, is_int = _numeric_param_vector(current_params)
+        if not names:
+            return current_params.copy()
         
         # 探索vs活用のバランスを取った調整
         exploration_factor = 0.3 if state.convergence_status == "converging" else 0.7
         
-        for param_name, param_value in current_params.items():
-            if isinstance(param_value, list) and len(param_value) > 0:
-                current_val = param_value[0]
-                if isinstance(current_val, (int, float)):
-                    # 不確実性を考慮した探索
-                    uncertainty = self._estimate_uncertainty(state, param_name)
-                    
-                    # 探索と活用のバランス
-                    if np.random.random() < exploration_factor:
-                        # 探索：不確実性の高い領域を探索
-                        noise = np.random.normal(0, uncertainty * current_val * 0.2)
-                    else:
-                        # 活用：既知の良い方向に調整
-                        gradient = self._estimate_gradient(state, param_name, 'sharpe_ratio')
-                        noise = gradient * state.adaptation_rate * current_val * 0.1
-                    
-                    new_val = current_val + noise
-                    new_val = max(1, min(new_val, current_val * 1.5))
-                    new_params[param_name] = [int(new_val) if isinstance(current_val, int) else new_val]
-        
-        return new_params
+        # 不確実性と勾配の簡易推定はパラメータによらないため1回だけ計算
+        uncertainty = self._estimate_uncertainty(state, names[0])
+        gradient = self._estimate_gradient(state, names[0], 'sharpe_ratio')
+        
+        # 探索と活用のバランス（乱数はパラメータ数分をまとめて生成）
+        explore = self._rng.random(len(names)) < exploration_factor
+        noises = self._rng.standard_normal(len(names))
+        deltas = np.where(
+            explore,
+            noises * uncertainty * values * 0.2,  # 探索：不確実性の高い領域を探索
+            gradient * state.adaptation_rate * values * 0.1  # 活用：既知の良い方向に調整
+        )
+        
+        new_values = _bounded_step(values, deltas, 1.5)
+        return _unpack_params(current_params, names, new_values, is_int)
     
     def _evolutionary_optimization(self, state: OptimizationState) -> Dict[str, Any]:
         """進化的最適化"""
-        current_params = state.current_params.copy()
+        current_params = state.current_params
+        names, values, is_int = _numeric_param_vector(current_params)
         
-        # 複数の候補を生成
-        candidates = []
-        for _ in range(5):
-            candidate = current_params.copy()
-            
-            for param_name, param_value in current_params.items():
-                if isinstance(param_value, list) and len(param_value) > 0:
-                    current_val = param_value[0]
-                    if isinstance(current_val, (int, float)):
-                        # 変異
-                        mutation_rate = state.adaptation_rate
-                        if np.random.random() < mutation_rate:
-                            noise = np.random.normal(0, current_val * 0.3)
-                            new_val = current_val + noise
-                            new_val = max(1, min(new_val, current_val * 2))
-                            candidate[param_name] = [int(new_val) if isinstance(current_val, int) else new_val]
-            
-            candidates.append(candidate)
+        # 複数の候補を生成（行: 候補、列: パラメータ）
+        n_candidates = 5
+        mutated = self._rng.random((n_candidates, len(names))) < state.adaptation_rate
+        deltas = self._rng.standard_normal((n_candidates, len(names))) * values * 0.3 * mutated
+        
+        candidates = [
+            _unpack_params(current_params, names, _bounded_step(values, deltas[k], 2.0), is_int, mutated[k])
+            for k in range(n_candidates)
+        ]
         
         # 最も有望な候補を選択（ここでは単純にランダム選択）
-        return np.random.choice(candidates)
+        return candidates[self._rng.integers(len(candidates))]
     
     def _random_search_optimization(self, state: OptimizationState) -> Dict[str, Any]:
         """ランダム探索最適化"""
-        current_params = state.current_params.copy()
-        new_params = current_params.copy()
-        
-        # ランダムに一部のパラメータを調整
-        for param_name, param_value in current_params.items():
-            if isinstance(param_value, list) and len(param_value) > 0:
-                current_val = param_value[0]
-                if isinstance(current_val, (int, float)) and np.random.random() < 0.3:
-                    # 30%の確率でパラメータを調整
-                    noise_scale = state.adaptation_rate * current_val * 0.2
-                    noise = np.random.normal(0, noise_scale)
-                    new_val = current_val + noise
-                    new_val = max(1, min(new_val, current_val * 1.5))
-                    new_params[param_name] = [int(new_val) if isinstance(current_val, int) else new_val]
-        
-        return new_params
+        current_params = state.current_params
+        names, values, is_int = _numeric_param_vector(current_params)
+        
+        # ランダムに一部のパラメータを調整（30%の確率でパラメータを調整）
+        adjusted = self._rng.random(len(names)) < 0.3
+        noise_scale = state.adaptation_rate * values * 0.2
+        deltas = self._rng.standard_normal(len(names)) * noise_scale
+        
+        new_values = _bounded_step(values, deltas, 1.5)
+        return _unpack_params(current_params, names, new_values, is_int, adjusted)
     
     def _estimate_gradient(self, state: OptimizationState, param_name: str, target_metric: str) -> float:
         """パラメータに対する勾配を推定"""
@@ -333,10 +410,10 @@ class DynamicParameterOptimizer:
             return 0.0
         
         # 最近の3つのデータポイントから線形回帰
-        recent_data = state.performance_history[-3:]
+        recent_data = _recent(state.performance_history, 3)
         
-        # 時間に対するメトリクスの変化率を計算
-        metrics = [d.get(target_metric, 0) for d in recent_data]
+        # 時間に対するメトリクスの変化率を計算（数値でない記録は除外）
+        metrics = [v for v in (d.get(target_metric, 0) for d in recent_data) if isinstance(v, (int, float))]
         
         if len(metrics) >= 2:
             # 簡単な差分による勾配推定
@@ -351,11 +428,7 @@ class DynamicParameterOptimizer:
             return 1.0  # 高い不確実性
         
         # 最近のパフォーマンスの変動を不確実性として使用
-        recent_sharpe = [
-            h.get('sharpe_ratio', 0)
-            for h in state.performance_history[-10:]
-            if 'sharpe_ratio' in h
-        ]
+        recent_sharpe = state.recent_sharpe(10)
         
         if len(recent_sharpe) >= 3:
             return np.std(recent_sharpe)
@@ -371,16 +444,29 @@ class DynamicParameterOptimizer:
         }
         
         for name, state in self.optimization_states.items():
-            status['strategies'][name] = {
-                'convergence_status': state.convergence_status,
-                'adaptation_rate': state.adaptation_rate,
-                'performance_history_length': len(state.performance_history),
-                'last_update': state.last_update,
-                'optimization_mode': state.optimization_mode
-            }
+            status['strategies'][name] = self._state_summary(state)
         
         return status
     
+    def get_strategy_status(self, strategy_name: str) -> Optional[Dict[str, Any]]:
+        """指定戦略の最適化状況を取得（未初期化の場合はNone）"""
+        state = self.optimization_states.get(strategy_name)
+        return self._state_summary(state) if state is not None else None
+    
+    def has_strategy(self, strategy_name: str) -> bool:
+        """指定戦略の最適化が初期化済みかを判定"""
+        return strategy_name in self.optimization_states
+    
+    def _state_summary(self, state: OptimizationState) -> Dict[str, Any]:
+        """最適化状態の概要を作成"""
+        return {
+            'convergence_status': state.convergence_status,
+            'adaptation_rate': state.adaptation_rate,
+            'performance_history_length': len(state.performance_history),
+            'last_update': state.last_update,
+            'optimization_mode': state.optimization_mode
+        }
+    
     def set_optimization_mode(self, strategy_name: str, mode: str):
         """最適化モードを設定"""
         if strategy_name in self.optimization_states:
@@ -392,7 +478,8 @@ class DynamicParameterOptimizer:
         """最適化状態をリセット"""
         if strategy_name in self.optimization_states:
             state = self.optimization_states[strategy_name]
-            state.performance_history = []
+            state.performance_history.clear()
+            state.rebuild_sharpe_window()
             state.convergence_status = "stable"
             state.adaptation_rate = self.adaptation_rate_base
             self.save_optimization_states()
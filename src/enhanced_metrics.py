@@ -11,10 +11,185 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from src.config import config
+from src.jit import njit, NUMBA_AVAILABLE
 from src.logger import get_logger
 
 logger = get_logger("metrics")
 
+def _max_run_length(mask: np.ndarray) -> int:
+    """Trueが連続する最大の長さ（ランレングス符号化で計算）"""
+    if len(mask) == 0:
+        return 0
+    # 値が切り替わる位置を連の先頭とし、次の先頭までの距離を連の長さとする
+    starts = np.flatnonzero(np.concatenate(([True], mask[1:] != mask[:-1])))
+    lengths = np.diff(np.append(starts, len(mask)))
+    return int(lengths[mask[starts]].max(initial=0))
+
+def _returns_array(equity: np.ndarray) -> np.ndarray:
+    """資産曲線から日次リターンを計算（計算できない値は除外）"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = np.diff(equity) / equity[:-1]
+    return returns[~np.isnan(returns)]
+
+def _drawdown_array(equity: np.ndarray) -> np.ndarray:
+    """資産曲線の各時点のドローダウン（直前までの最高値からの下落率）"""
+    # fmaxは欠損値を無視して累積最大値を更新する（expanding().max()と同じ扱い）
+    peak = np.fmax.accumulate(equity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (equity - peak) / peak
+
+def _return_statistics(returns: np.ndarray) -> Dict[str, float]:
+    """基本指標・リスク指標で共通に使うリターンの統計量をまとめて計算"""
+    n = len(returns)
+    downside = returns[returns < 0]
+    
+    # 下方偏差（下落日が無い場合は0、1日のみの場合は標本標準偏差が定義できないためNaN）
+    if len(downside) > 1:
+        downside_std = downside.std(ddof=1)
+    elif len(downside) == 1:
+        downside_std = np.nan
+    else:
+        downside_std = 0
+        
+    # VaRは1回の分位点計算（ソート1回）で両方の水準を求め、CVaRはその閾値以下の平均
+    if n > 0:
+        var_99, var_95 = np.quantile(returns, [0.01, 0.05], method='linear')
+        cvar_99 = returns[returns <= var_99].mean()
+        cvar_95 = returns[returns <= var_95].mean()
+    else:
+        var_99 = var_95 = cvar_99 = cvar_95 = np.nan
+    
+    return {
+        'mean': returns.mean() if n > 0 else np.nan,
+        'std': returns.std(ddof=1) if n > 1 else np.nan,
+        'downside_std': downside_std,
+        'var_95': var_95,
+        'var_99': var_99,
+        'cvar_95': cvar_95,
+        'cvar_99': cvar_99
+    }
+
+@njit(cache=True, error_model='numpy')
+def _sorted_quantile(sorted_returns: np.ndarray, q: float) -> float:
+    """ソート済み配列の分位点（np.quantileのmethod='linear'と同じ線形補間）"""
+    pos = q * (len(sorted_returns) - 1)
+    lo = int(np.floor(pos))
+    hi = min(lo + 1, len(sorted_returns) - 1)
+    return sorted_returns[lo] + (sorted_returns[hi] - sorted_returns[lo]) * (pos - lo)
+
+@njit(cache=True, error_model='numpy')
+def _equity_kernel(equity: np.ndarray):
+    """資産曲線を1回走査し、リターン・共通統計量・最大ドローダウン・潰瘍指数をまとめて計算"""
+    n = len(equity)
+    returns = np.empty(max(n - 1, 0))
+    n_ret = 0
+    mean = 0.0
+    m2 = 0.0
+    n_neg = 0
+    neg_mean = 0.0
+    neg_m2 = 0.0
+    peak = np.nan
+    max_dd = np.nan
+    sum_dd2 = 0.0
+    n_dd = 0
+    
+    for i in range(n):
+        e = equity[i]
+        
+        # 欠損値は無視して最高値を更新（np.fmax.accumulateと同じ扱い）
+        if not np.isnan(e) and (np.isnan(peak) or e > peak):
+            peak = e
+        dd = (e - peak) / peak
+        if not np.isnan(dd):
+            if n_dd == 0 or dd < max_dd:
+                max_dd = dd
+            sum_dd2 += dd * dd
+            n_dd += 1
+            
+        if i == 0:
+            continue
+        r = (e - equity[i - 1]) / equity[i - 1]
+        if np.isnan(r):
+            continue
+        returns[n_ret] = r
+        n_ret += 1
+        
+        # 平均・分散はWelford法で逐次更新（下落日のみの系列も同時に集計）
+        delta = r - mean
+        mean += delta / n_ret
+        m2 += delta * (r - mean)
+        if r < 0:
+            n_neg += 1
+            neg_delta = r - neg_mean
+            neg_mean += neg_delta / n_neg
+            neg_m2 += neg_delta * (r - neg_mean)
+            
+    returns = returns[:n_ret]
+    std = np.sqrt(m2 / (n_ret - 1)) if n_ret > 1 else np.nan
+    ulcer = np.sqrt(sum_dd2 / n_dd) if n_dd > 0 else np.nan
+    
+    # 下方偏差（下落日が無い場合は0、1日のみの場合は標本標準偏差が定義できないためNaN）
+    if n_neg > 1:
+        downside_std = np.sqrt(neg_m2 / (n_neg - 1))
+    elif n_neg == 1:
+        downside_std = np.nan
+    else:
+        downside_std = 0.0
+        
+    if n_ret == 0:
+        nan = np.nan
+        return returns, nan, std, downside_std, nan, nan, nan, nan, max_dd, ulcer
+        
+    # VaRはソート済みのコピーから求め、CVaRは先頭から閾値以下の値を平均
+    sorted_returns = np.sort(returns)
+    var_99 = _sorted_quantile(sorted_returns, 0.01)
+    var_95 = _sorted_quantile(sorted_returns, 0.05)
+    sum_99 = 0.0
+    sum_95 = 0.0
+    n_99 = 0
+    n_95 = 0
+    for r in sorted_returns:
+        if r > var_95:
+            break
+        sum_95 += r
+        n_95 += 1
+        if r <= var_99:
+            sum_99 += r
+            n_99 += 1
+    cvar_99 = sum_99 / n_99 if n_99 > 0 else np.nan
+    cvar_95 = sum_95 / n_95 if n_95 > 0 else np.nan
+    
+    return returns, mean, std, downside_std, var_95, var_99, cvar_95, cvar_99, max_dd, ulcer
+
+# 初回呼び出し時のコンパイルを避けるため読み込み時にウォームアップ
+if NUMBA_AVAILABLE:
+    _equity_kernel(np.ones(3))
+
+def _equity_statistics(equity: np.ndarray) -> Tuple[np.ndarray, Dict[str, float]]:
+    """資産曲線からリターンと各指標で共有する統計量（最大ドローダウン・潰瘍指数を含む）を計算"""
+    if NUMBA_AVAILABLE:
+        (returns, mean, std, downside_std, var_95, var_99,
+         cvar_95, cvar_99, max_dd, ulcer) = _equity_kernel(equity)
+        return returns, {
+            'mean': mean,
+            'std': std,
+            'downside_std': downside_std,
+            'var_95': var_95,
+            'var_99': var_99,
+            'cvar_95': cvar_95,
+            'cvar_99': cvar_99,
+            'max_drawdown': max_dd,
+            'ulcer_index': ulcer
+        }
+        
+    # numba未導入時はnumpyのベクトル演算で計算（Pythonループより高速）
+    returns = _returns_array(equity)
+    drawdown = _drawdown_array(equity)
+    stats_dict = _return_statistics(returns)
+    stats_dict['max_drawdown'] = float(np.nanmin(drawdown))
+    stats_dict['ulcer_index'] = float(np.sqrt(np.nanmean(drawdown * drawdown)))
+    return returns, stats_dict
+
 class EnhancedMetrics:
     """拡張評価指標クラス"""
     
@@ -25,8 +200,15 @@ class EnhancedMetrics:
         """全評価指標を計算"""
         metrics = {}
         
+        # リターンと共通統計量（ドローダウン系を含む）は1回だけ計算し、各指標で共有
+        if equity_curve.empty:
+            returns, return_stats = np.empty(0), {}
+        else:
+            equity = equity_curve['Equity'].to_numpy(dtype=np.float64)
+            returns, return_stats = _equity_statistics(equity)
+        
         # 基本指標
-        basic_metrics = self._calculate_basic_metrics(equity_curve)
+        basic_metrics = self._calculate_basic_metrics(equity_curve, return_stats)
         metrics.update(basic_metrics)
         
         # 取引指標
@@ -35,22 +217,20 @@ class EnhancedMetrics:
             metrics.update(trading_metrics)
             
         # リスク指標
-        risk_metrics = self._calculate_risk_metrics(equity_curve)
+        risk_metrics = self._calculate_risk_metrics(equity_curve, return_stats)
         metrics.update(risk_metrics)
         
         # 安定性指標
-        stability_metrics = self._calculate_stability_metrics(equity_curve)
+        stability_metrics = self._calculate_stability_metrics(equity_curve, returns)
         metrics.update(stability_metrics)
         
         return metrics
         
-    def _calculate_basic_metrics(self, equity_curve: pd.DataFrame) -> Dict[str, float]:
+    def _calculate_basic_metrics(self, equity_curve: pd.DataFrame, return_stats: Dict[str, float]) -> Dict[str, float]:
         """基本指標の計算"""
         if equity_curve.empty:
             return {}
             
-        returns = equity_curve['Equity'].pct_change().dropna()
-        
         # 総リターン
         total_return = (equity_curve['Equity'].iloc[-1] / equity_curve['Equity'].iloc[0]) - 1
         
@@ -59,20 +239,19 @@ class EnhancedMetrics:
         annualized_return = ((1 + total_return) ** (365 / days)) - 1 if days > 0 else 0
         
         # ボラティリティ
-        volatility = returns.std() * np.sqrt(252)
+        volatility = return_stats['std'] * np.sqrt(252)
         
         # シャープレシオ
         risk_free_rate = 0.02  # 2%をリスクフリーレートとして仮定
-        excess_returns = returns - (risk_free_rate / 252)
-        sharpe_ratio = (excess_returns.mean() * 252) / volatility if volatility > 0 else 0
+        excess_return_mean = return_stats['mean'] - (risk_free_rate / 252)
+        sharpe_ratio = (excess_return_mean * 252) / volatility if volatility > 0 else 0
         
         # ソルティノレシオ
-        downside_returns = returns[returns < 0]
-        downside_deviation = downside_returns.std() * np.sqrt(252) if len(downside_returns) > 0 else 0
-        sortino_ratio = (excess_returns.mean() * 252) / downside_deviation if downside_deviation > 0 else 0
+        downside_deviation = return_stats['downside_std'] * np.sqrt(252)
+        sortino_ratio = (excess_return_mean * 252) / downside_deviation if downside_deviation > 0 else 0
         
         # 最大ドローダウン
-        max_drawdown = self._calculate_max_drawdown(equity_curve['Equity'])
+        max_drawdown = return_stats['max_drawdown']
         
         # カルマーレシオ
         calmar_ratio = annualized_return / abs(max_drawdown) if max_drawdown != 0 else 0
@@ -125,43 +304,27 @@ class EnhancedMetrics:
             'consecutive_losses': consecutive_losses
         }
         
-    def _calculate_risk_metrics(self, equity_curve: pd.DataFrame) -> Dict[str, float]:
+    def _calculate_risk_metrics(self, equity_curve: pd.DataFrame, return_stats: Dict[str, float]) -> Dict[str, float]:
         """リスク指標の計算"""
         if equity_curve.empty:
             return {}
             
-        returns = equity_curve['Equity'].pct_change().dropna()
-        
-        # VaR (Value at Risk)
-        var_95 = np.percentile(returns, 5)
-        var_99 = np.percentile(returns, 1)
-        
-        # CVaR (Conditional Value at Risk)
-        cvar_95 = returns[returns <= var_95].mean()
-        cvar_99 = returns[returns <= var_99].mean()
-        
-        # 下方偏差
-        downside_returns = returns[returns < 0]
-        downside_deviation = downside_returns.std() if len(downside_returns) > 0 else 0
-        
-        # 潰瘍指数
-        ulcer_index = self._calculate_ulcer_index(equity_curve['Equity'])
-        
+        # VaR / CVaR (Conditional Value at Risk) / 下方偏差 / 潰瘍指数は共通統計量から取得
         return {
-            'var_95': var_95,
-            'cvar_95': cvar_95,
-            'var_99': var_99,
-            'cvar_99': cvar_99,
-            'downside_deviation': downside_deviation,
-            'ulcer_index': ulcer_index
+            'var_95': return_stats['var_95'],
+            'cvar_95': return_stats['cvar_95'],
+            'var_99': return_stats['var_99'],
+            'cvar_99': return_stats['cvar_99'],
+            'downside_deviation': return_stats['downside_std'],
+            'ulcer_index': return_stats['ulcer_index']
         }
         
-    def _calculate_stability_metrics(self, equity_curve: pd.DataFrame) -> Dict[str, float]:
+    def _calculate_stability_metrics(self, equity_curve: pd.DataFrame, returns: np.ndarray) -> Dict[str, float]:
         """安定性指標の計算"""
         if equity_curve.empty:
             return {}
             
-        returns = equity_curve['Equity'].pct_change().dropna()
+        returns = pd.Series(returns)
         
         # ロールングパフォーマンス
         rolling_performance = self._calculate_rolling_performance(returns)
@@ -178,52 +341,19 @@ class EnhancedMetrics:
             'autocorrelation': autocorrelation
         }
         
-    def _calculate_max_drawdown(self, equity_series: pd.Series) -> float:
-        """最大ドローダウンの計算"""
-        peak = equity_series.expanding().max()
-        drawdown = (equity_series - peak) / peak
-        return drawdown.min()
-        
     def _calculate_consecutive_wins(self, trades_df: pd.DataFrame) -> int:
         """連続勝利回数の計算"""
         if trades_df.empty:
             return 0
             
-        max_consecutive = 0
-        current_consecutive = 0
-        
-        for pnl in trades_df['PnL']:
-            if pnl > 0:
-                current_consecutive += 1
-                max_consecutive = max(max_consecutive, current_consecutive)
-            else:
-                current_consecutive = 0
-                
-        return max_consecutive
+        return _max_run_length(trades_df['PnL'].to_numpy() > 0)
         
     def _calculate_consecutive_losses(self, trades_df: pd.DataFrame) -> int:
         """連続損失回数の計算"""
         if trades_df.empty:
             return 0
             
-        max_consecutive = 0
-        current_consecutive = 0
-        
-        for pnl in trades_df['PnL']:
-            if pnl < 0:
-                current_consecutive += 1
-                max_consecutive = max(max_consecutive, current_consecutive)
-            else:
-                current_consecutive = 0
-                
-        return max_consecutive
-        
-    def _calculate_ulcer_index(self, equity_series: pd.Series) -> float:
-        """潰瘍指数の計算"""
-        peak = equity_series.expanding().max()
-        drawdown = (equity_series - peak) / peak
-        squared_drawdown = drawdown ** 2
-        return np.sqrt(squared_drawdown.mean())
+        return _max_run_length(trades_df['PnL'].to_numpy() < 0)
         
     def _calculate_rolling_performance(self, returns: pd.Series, window: int = 252) -> float:
         """ロールングパフォーマンスの計算"""
@@ -1,9 +1,11 @@
 import json
 import os
 import hashlib
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass, asdict
 from enum import Enum
@@ -34,6 +36,44 @@ class ImprovementRecord:
     status: str  # "pending", "success", "failed", "adopted", "rejected"
     rollback_to: Optional[str] = None
 
+def _hashable_param(value: Any) -> Any:
+    """パラメータ値を等価比較可能なハッシュ値に変換（リストはタプル、辞書はソート済みタプル）"""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _hashable_param(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable_param(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+def _params_fingerprint(params: Dict[str, Any]) -> frozenset:
+    """パラメータ辞書の内容から完全一致判定用のキーを作成"""
+    return frozenset((str(k), _hashable_param(v)) for k, v in params.items())
+
+def _encode_params(params_list: List[Dict[str, Any]], 
+                   keys: List[str], 
+                   codes: Dict[Any, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """パラメータ辞書群を (数値, 非数値コード, キー有無) の行列に変換"""
+    shape = (len(params_list), len(keys))
+    numeric = np.full(shape, np.nan)
+    code = np.full(shape, -1, dtype=np.int64)
+    present = np.zeros(shape, dtype=bool)
+    
+    for i, params in enumerate(params_list):
+        for j, key in enumerate(keys):
+            if key not in params:
+                continue
+            value = params[key]
+            present[i, j] = True
+            if isinstance(value, (int, float)):
+                numeric[i, j] = value
+            else:
+                code[i, j] = codes.setdefault(_hashable_param(value), len(codes))
+    
+    return numeric, code, present
+
 class ImprovementHistoryManager:
     """改善履歴を管理するクラス"""
     
@@ -48,11 +88,19 @@ class ImprovementHistoryManager:
         self.history: List[ImprovementRecord] = []
         self.performance_tracking: Dict[str, List[Dict[str, Any]]] = {}
         
+        # バッチ書き込み中は保存を遅延する
+        self._batch_depth = 0
+        self._pending_save = False
+        
+        # 戦略ごとの履歴パラメータのフィンガープリント（履歴の追加・再読込で破棄）
+        self._fingerprints: Optional[Dict[str, set]] = None
+        
         self.load_history()
         self.load_performance_tracking()
     
     def load_history(self):
         """履歴ファイルから改善記録を読み込み"""
+        self._fingerprints = None
         if self.history_file.exists():
             try:
                 with open(self.history_file, 'r', encoding='utf-8') as f:
@@ -65,8 +113,24 @@ class ImprovementHistoryManager:
         else:
             self.history = []
     
+    @contextmanager
+    def batch(self):
+        """ブロック内の履歴保存をまとめ、終了時に1回だけ書き込む"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._pending_save:
+                self._pending_save = False
+                self.save_history()
+    
     def save_history(self):
         """改善記録を履歴ファイルに保存"""
+        if self._batch_depth > 0:
+            self._pending_save = True
+            return
+        
         try:
             with open(self.history_file, 'w', encoding='utf-8') as f:
                 json.dump([asdict(record) for record in self.history], f, 
@@ -133,6 +197,7 @@ class ImprovementHistoryManager:
         )
         
         self.history.append(record)
+        self._fingerprints = None
         self.save_history()
         
         logger.info(f"改善記録を追加: {improvement_id} ({strategy_name})")
@@ -165,50 +230,55 @@ class ImprovementHistoryManager:
                                  new_params: Dict[str, Any], 
                                  threshold: float = 0.9) -> List[ImprovementRecord]:
         """類似の改善履歴をチェック（無限ループ防止）"""
-        similar_records = []
-        
-        for record in self.history:
-            if record.strategy_name != strategy_name:
-                continue
-            
-            similarity = self._calculate_param_similarity(record.new_params, new_params)
-            if similarity >= threshold:
-                similar_records.append(record)
-        
-        return similar_records
+        return self.check_similar_improvements_batch(strategy_name, [new_params], threshold)[0]
     
-    def _calculate_param_similarity(self, params1: Dict[str, Any], params2: Dict[str, Any]) -> float:
-        """パラメータの類似度を計算"""
-        if not params1 or not params2:
-            return 0.0
-        
-        # 共通のキーを取得
-        common_keys = set(params1.keys()) & set(params2.keys())
-        if not common_keys:
-            return 0.0
-        
-        # 数値パラメータの類似度を計算
-        similarities = []
-        for key in common_keys:
-            val1 = params1[key]
-            val2 = params2[key]
-            
-            if isinstance(val1, (int, float)) and isinstance(val2, (int, float)):
-                # 数値の場合は相対的な差を計算
-                if val1 == 0 and val2 == 0:
-                    similarity = 1.0
-                elif val1 == 0 or val2 == 0:
-                    similarity = 0.0
-                else:
-                    diff = abs(val1 - val2) / max(abs(val1), abs(val2))
-                    similarity = 1.0 - min(diff, 1.0)
-            else:
-                # その他の場合は完全一致かどうか
-                similarity = 1.0 if val1 == val2 else 0.0
-            
-            similarities.append(similarity)
-        
-        return sum(similarities) / len(similarities) if similarities else 0.0
+    def find_identical_improvements(self, strategy_name: str, params_list: List[Dict[str, Any]]) -> List[bool]:
+        """各パラメータ候補が履歴と完全に一致するかを判定（類似度計算を行わずハッシュで照合）"""
+        if self._fingerprints is None:
+            fingerprints: Dict[str, set] = {}
+            for record in self.history:
+                if record.new_params:
+                    fingerprints.setdefault(record.strategy_name, set()).add(_params_fingerprint(record.new_params))
+            self._fingerprints = fingerprints
+        
+        known = self._fingerprints.get(strategy_name)
+        if not known:
+            return [False] * len(params_list)
+        return [bool(params) and _params_fingerprint(params) in known for params in params_list]
+    
+    def check_similar_improvements_batch(self, 
+                                         strategy_name: str, 
+                                         params_list: List[Dict[str, Any]], 
+                                         threshold: float = 0.9) -> List[List[ImprovementRecord]]:
+        """複数のパラメータ候補について類似の改善履歴をまとめてチェック"""
+        records = [r for r in self.history if r.strategy_name == strategy_name and r.new_params]
+        if not records or not params_list:
+            return [[] for _ in params_list]
+        
+        # 履歴と候補で共通のキー順を決めて行列化
+        history_params = [r.new_params for r in records]
+        keys = list(dict.fromkeys(k for params in (*history_params, *params_list) for k in params))
+        codes: Dict[Any, int] = {}
+        hist_num, hist_code, hist_has = _encode_params(history_params, keys, codes)
+        cand_num, cand_code, cand_has = _encode_params(params_list, keys, codes)
+        
+        # (候補, 履歴, キー) の3次元で類似度を一括計算
+        # 共通キーごとに、数値は相対差（両方0なら一致）、それ以外は完全一致で採点し平均を取る
+        a, b = cand_num[:, None, :], hist_num[None, :, :]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            denom = np.maximum(np.abs(a), np.abs(b))
+            numeric_sim = np.where(denom == 0, 1.0, 1.0 - np.minimum(np.abs(a - b) / denom, 1.0))
+        both_numeric = ~np.isnan(a) & ~np.isnan(b)
+        both_coded = (cand_code[:, None, :] >= 0) & (hist_code[None, :, :] >= 0)
+        coded_sim = both_coded & (cand_code[:, None, :] == hist_code[None, :, :])
+        
+        common = cand_has[:, None, :] & hist_has[None, :, :]
+        key_sim = np.where(both_numeric, numeric_sim, coded_sim.astype(np.float64))
+        counts = common.sum(axis=-1)
+        totals = np.where(common, key_sim, 0.0).sum(axis=-1)
+        similarity = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+        
+        return [[records[j] for j in np.flatnonzero(row >= threshold)] for row in similarity]
     
     def get_improvement_summary(self) -> Dict[str, Any]:
         """改善履歴のサマリーを取得"""
@@ -426,6 +496,19 @@ class ImprovementHistoryManager:
         sorted_adopted = sorted(adopted_records, key=lambda x: x.timestamp)
         return sorted_adopted[-2]  # 最新の前の記録
     
+    def peek_rollback_target(self, strategy_name: str) -> Optional[ImprovementRecord]:
+        """ロールバック対象を1回の走査で取得（採用記録が2件未満の場合はNone）"""
+        latest: Optional[ImprovementRecord] = None
+        previous: Optional[ImprovementRecord] = None
+        for record in self.history:
+            if record.strategy_name != strategy_name or record.status != "adopted":
+                continue
+            if latest is None or record.timestamp >= latest.timestamp:
+                latest, previous = record, latest
+            elif previous is None or record.timestamp >= previous.timestamp:
+                previous = record
+        return previous
+    
     def export_history_report(self, output_file: str = "reports/improvement_history.html"):
         """改善履歴のレポートを生成"""
         summary = self.get_improvement_summary()
@@ -0,0 +1,21 @@
+"""
+JITコンパイル補助モジュール
+numbaが利用可能な場合は数値計算関数をコンパイルし、未導入の環境では通常のPython関数として実行します
+"""
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+def njit(*args, **kwargs):
+    """numba.njitの代替デコレータ（@njit と @njit(cache=True) の両方の書き方に対応）"""
+    if NUMBA_AVAILABLE:
+        return _numba_njit(*args, **kwargs)
+
+    # numba未導入時は関数をそのまま返す
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
@@ -0,0 +1,27 @@
+"""
+JSON入出力補助モジュール
+orjsonが利用可能な場合は高速なシリアライザを使用し、未導入の環境では標準のjsonモジュールで処理します
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+def json_dumps(obj: Any) -> bytes:
+    """インデント付きのJSONバイト列に変換（JSONで表現できない値は文字列化）"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                            | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode('utf-8')
+
+def json_loads(data: bytes) -> Any:
+    """JSONバイト列（または文字列）を解析"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)